@@ -4,10 +4,24 @@ import asyncio
 from redbot.core import commands
 from redbot.core import checks
 from redbot.core import Config
+from redbot.core.data_manager import cog_data_path
+from redbot.core.utils.chat_formatting import box, pagify
+from datetime import datetime, timezone
 import errno
 from io import StringIO
+import json
+import random
+import sys
 import time
 
+from .diff import IndexDiff, diff_snapshots, fingerprint_index, fingerprint_repo
+from .fetcher import IndexFetcher, IndexFetchError
+from .history import HistoryStore
+from .looplag import LoopLagMonitor
+from .publish import FORMATS, publish_changes
+from .render import diff_lines
+from .telemetry import CheckRun, CheckStats, log
+
 
 IX_PROTOCOL = 1
 CC_INDEX_LINK = f"https://raw.githubusercontent.com/Cog-Creators/Red-Index/master/index/{IX_PROTOCOL}-min.json"
@@ -66,47 +80,87 @@ SORT_ORDER = [
 	'https://github.com/zhaobenny/bz-cogs',
 	'https://github.com/sravan1946/sravan-cogs',
 ]
+SORT_POSITIONS = {url: position for position, url in enumerate(SORT_ORDER)}
+# minimum seconds between checks run for held changes, so a failing check isn't retried in a tight loop
+PENDING_RETRY_DELAY = 60
+# {CHANNEL_ID: SETTINGS} of the channels that used to be hard-coded, seeded by the schema migration
+# channel IDs are strings as Config stores JSON
+LEGACY_DESTINATIONS = {
+	'598626368665813005': {'format': 'full', 'publish': False, 'header': 'The cogboard needs to be updated!\n'},
+	'723262416766500937': {'format': 'full', 'publish': True, 'header': ''},
+}
+
+
+def _intern_authors(authors):
+	return tuple(sys.intern(a) for a in authors)
 
 
 class Repo:
+	__slots__ = ('url', 'approved', 'author', 'description', 'short', 'name', 'branch', 'cogs')
+	
 	def __init__(self, url: str, raw_data: dict):
-		self.url = url
+		self.url = sys.intern(url)
 		self.approved = 'approved' == raw_data.get("rx_category", "unapproved")
-		self.author = raw_data.get("author", ["Unknown"])
+		self.author = _intern_authors(raw_data.get("author", ["Unknown"]))
 		self.description = raw_data.get("description", "")
 		self.short = raw_data.get("short", "")
-		self.name = raw_data.get("name", "Unknown")
+		self.name = sys.intern(raw_data.get("name", "Unknown"))
 		self.branch = raw_data.get("rx_branch", "")
 		self.cogs = []
 		if isinstance(raw_data["rx_cogs"], dict):
 			for cog_name, cog_raw in raw_data["rx_cogs"].items():
 				if cog_raw.get("hidden", False) or cog_raw.get("disabled", False):
 					continue
-				self.cogs.append(Cog(cog_name, self, cog_raw))
+				self.cogs.append(Cog(cog_name, cog_raw, self.author))
 		else:
 			for data in raw_data["rx_cogs"]:
-				self.cogs.append(Cog(data['name'], self, data))
+				self.cogs.append(Cog(data['name'], data, self.author))
+	
+	@classmethod
+	def from_raw(cls, raw: dict):
+		"""Build a Repo from the data returned by `to_raw()`."""
+		return cls(raw['url'], {
+			**raw,
+			'rx_branch': raw['branch'],
+			'rx_category': 'approved' if raw['approved'] else 'unapproved',
+		})
 	
 	def to_raw(self):
-		result = vars(self).copy()
-		cogs = []
-		for c in result['cogs']:
-			c = vars(c).copy()
-			c.pop('repo', None)
-			cogs.append(c)
-		del result['cogs']
-		result['rx_cogs'] = cogs
-		return result
-		
+		return {
+			'url': self.url,
+			'approved': self.approved,
+			'author': list(self.author),
+			'description': self.description,
+			'short': self.short,
+			'name': self.name,
+			'branch': self.branch,
+			'rx_cogs': [c.to_raw() for c in self.cogs],
+		}
+
+
 class Cog:
-	def __init__(self, name: str, repo: Repo, raw_data: dict):
-		self.name = name
-		self.author = raw_data.get("author", ["Unknown"])
+	__slots__ = ('name', 'author', 'description', 'short')
+	# hidden and disabled cogs are skipped when building the repo
+	hidden = False
+	disabled = False
+	
+	def __init__(self, name: str, raw_data: dict, repo_author: tuple = ()):
+		self.name = sys.intern(name)
+		author = raw_data.get("author", ["Unknown"])
+		# most cogs share the author list of their repo
+		self.author = repo_author if tuple(author) == repo_author else _intern_authors(author)
 		self.description = raw_data.get("description", "")
 		self.short = raw_data.get("short", "")
-		self.hidden = False
-		self.disabled = False
-		self.repo = repo
+	
+	def to_raw(self):
+		return {
+			'name': self.name,
+			'author': list(self.author),
+			'description': self.description,
+			'short': self.short,
+			'hidden': False,
+			'disabled': False,
+		}
 
 
 class ApprovedUpdater(commands.Cog):
@@ -120,10 +174,75 @@ class ApprovedUpdater(commands.Cog):
 		self.bot = bot
 		self.config = Config.get_conf(self, identifier=145519400223506432)
 		self.config.register_global(
-			lastRaw = []
+			schema_version = 0,
+			lastRaw = [],
+			# {URL: HASH} of the repos in the last snapshot
+			lastHashes = {},
+			lastHash = None,
+			check_interval = 3600,
+			check_jitter = 300,
+			fetch_timeout = 30,
+			fetch_connect_timeout = 10,
+			fetch_retries = 3,
+			# {CHANNEL_ID: SETTINGS}, a non-empty default would be merged back into every read
+			destinations = {},
+			publish_concurrency = 5,
+			# minutes the index has to stay unchanged before held changes are sent, 0 sends them right away
+			quiet_window = 0,
+			# {URL: RAW_REPO or None} of repos changed since the held changes started, as they were before
+			pendingBase = {},
+			pendingSince = None,
 		)
+		# {URL: RAW_REPO}
+		self.config.init_custom('SNAPSHOT', 1)
+		self.config.register_custom('SNAPSHOT')
 		self.last_check = time.time()
-		
+		self.fetcher = IndexFetcher(CC_INDEX_LINK, cog_data_path(self))
+		self.history = HistoryStore(cog_data_path(self) / 'history')
+		self.session = None
+		self._check_lock = asyncio.Lock()
+		self._reschedule = asyncio.Event()
+		self._scheduler_task = None
+		# (INDEX_HASH, COGBOARD)
+		self._cogboard_cache = (None, '')
+		self.stats = CheckStats()
+	
+	async def cog_load(self):
+		await self._config_migration()
+		self.session = aiohttp.ClientSession(
+			connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300),
+		)
+		self._scheduler_task = asyncio.create_task(self._scheduler())
+	
+	async def cog_unload(self):
+		if self._scheduler_task is not None:
+			self._scheduler_task.cancel()
+		if self.session is not None and not self.session.closed:
+			await self.session.close()
+	
+	async def _config_migration(self):
+		schema_version = await self.config.schema_version()
+		if schema_version == 0:
+			await self._migrate_schema_0_to_1()
+			await self.config.schema_version.set(1)
+			schema_version = 1
+		if schema_version == 1:
+			await self._migrate_schema_1_to_2()
+			await self.config.schema_version.set(2)
+	
+	async def _migrate_schema_0_to_1(self):
+		# the snapshot moved from a single list to per repo entries with content hashes
+		old = await self.config.lastRaw()
+		snapshot = {r['url']: r for r in old}
+		hashes = {url: fingerprint_repo(raw) for url, raw in snapshot.items()}
+		await self.config.custom('SNAPSHOT').set(snapshot)
+		await self.config.lastHashes.set(hashes)
+		await self.config.lastHash.set(fingerprint_index(hashes))
+		await self.config.lastRaw.clear()
+	
+	async def _migrate_schema_1_to_2(self):
+		# the notification channels moved from the code to Config
+		await self.config.destinations.set(LEGACY_DESTINATIONS)
 	
 	@commands.mod()
 	@commands.group()
@@ -131,153 +250,494 @@ class ApprovedUpdater(commands.Cog):
 		"""Group command for Approved Repository Updater."""
 		pass
 	
+	@aru.command()
+	async def check(self, ctx):
+		"""Check the index for changes right now."""
+		if self._check_lock.locked():
+			await ctx.send('A check is already running.')
+			return
+		async with ctx.typing():
+			changed = await self._run_check()
+		if changed:
+			await ctx.send('Check finished, the cogboard needs to be updated.')
+		elif await self.config.pendingBase():
+			await ctx.send('Check finished, the changes will be sent once the index stops changing.')
+		else:
+			await ctx.send('Check finished, no changes found.')
+	
+	@commands.admin()
+	@aru.command()
+	async def interval(self, ctx, seconds: int):
+		"""Set how often the index is checked, in seconds."""
+		if seconds < 60:
+			await ctx.send('The interval has to be at least 60 seconds.')
+			return
+		await self.config.check_interval.set(seconds)
+		self._reschedule.set()
+		await ctx.send(f'The index will now be checked every {seconds} seconds.')
+	
+	@commands.admin()
+	@aru.command()
+	async def jitter(self, ctx, seconds: int):
+		"""Set the maximum random delay added to each scheduled check, in seconds."""
+		if seconds < 0:
+			await ctx.send('The jitter can\'t be negative.')
+			return
+		await self.config.check_jitter.set(seconds)
+		self._reschedule.set()
+		await ctx.send(f'Scheduled checks will now be delayed by up to {seconds} seconds.')
+	
+	@commands.admin()
+	@aru.command()
+	async def quietwindow(self, ctx, minutes: int):
+		"""
+		Set for how many minutes the index has to stay unchanged before the changes are sent.
+		
+		Changes found in the meantime are merged, so only the net diff is sent. Use 0 to send changes right away.
+		"""
+		if minutes < 0:
+			await ctx.send('The quiet window can\'t be negative.')
+			return
+		await self.config.quiet_window.set(minutes)
+		self._reschedule.set()
+		if minutes:
+			await ctx.send(f'Changes will now be sent once the index didn\'t change for {minutes} minutes.')
+		else:
+			await ctx.send('Changes will now be sent right away.')
+	
+	@commands.admin()
+	@aru.command()
+	async def timeout(self, ctx, total: int, connect: int = None):
+		"""Set the total and connect timeouts of a single index request, in seconds."""
+		if connect is None:
+			connect = min(total, await self.config.fetch_connect_timeout())
+		if connect <= 0 or total < connect:
+			await ctx.send('Timeouts have to be positive and the connect timeout can\'t exceed the total one.')
+			return
+		await self.config.fetch_timeout.set(total)
+		await self.config.fetch_connect_timeout.set(connect)
+		await ctx.send(f'Index requests will now time out after {total} seconds ({connect} seconds to connect).')
+	
+	@commands.admin()
+	@aru.command()
+	async def retries(self, ctx, retries: int):
+		"""Set how many times a failed index request is retried."""
+		if not 0 <= retries <= 10:
+			await ctx.send('The number of retries has to be between 0 and 10.')
+			return
+		await self.config.fetch_retries.set(retries)
+		await ctx.send(f'Failed index requests will now be retried up to {retries} times.')
+	
+	@commands.admin()
+	@aru.group()
+	async def destination(self, ctx):
+		"""Manage the channels the changes are sent to."""
+		pass
+	
+	@destination.command(name='list')
+	async def destination_list(self, ctx):
+		"""List the channels the changes are sent to."""
+		destinations = await self.config.destinations()
+		if not destinations:
+			await ctx.send('There are no destinations, changes aren\'t sent anywhere.')
+			return
+		lines = []
+		for channel_id, settings in destinations.items():
+			publish = ', published' if settings['publish'] else ''
+			header = f' with header "{settings["header"].strip()}"' if settings['header'] else ''
+			lines.append(f'<#{channel_id}> - {settings["format"]}{publish}{header}')
+		await ctx.send('\n'.join(lines))
+	
+	@destination.command(name='add')
+	async def destination_add(self, ctx, channel: discord.TextChannel, format: str = 'full', publish: bool = False):
+		"""
+		Send the changes to a channel, or update the settings of a channel that is already a destination.
+		
+		The format is either `full` (the whole diff) or `summary` (counts and added/removed repos).
+		Publishing only works in news channels.
+		"""
+		format = format.lower()
+		if format not in FORMATS:
+			await ctx.send(f'The format has to be one of: {", ".join(FORMATS)}.')
+			return
+		if publish and not channel.is_news():
+			await ctx.send('Messages can only be published in news channels.')
+			return
+		async with self.config.destinations() as destinations:
+			header = destinations.get(str(channel.id), {}).get('header', '')
+			destinations[str(channel.id)] = {'format': format, 'publish': publish, 'header': header}
+		await ctx.send(f'Changes will now be sent to {channel.mention} ({format}{", published" if publish else ""}).')
+	
+	@destination.command(name='header')
+	async def destination_header(self, ctx, channel: discord.TextChannel, *, header: str = ''):
+		"""Set the text sent before the changes in a destination channel, leave empty to remove it."""
+		async with self.config.destinations() as destinations:
+			if str(channel.id) not in destinations:
+				await ctx.send(f'{channel.mention} is not a destination.')
+				return
+			destinations[str(channel.id)]['header'] = f'{header}\n' if header else ''
+		await ctx.send('The header was updated.')
+	
+	@destination.command(name='remove')
+	async def destination_remove(self, ctx, channel_id: int):
+		"""Stop sending the changes to a channel."""
+		async with self.config.destinations() as destinations:
+			if destinations.pop(str(channel_id), None) is None:
+				await ctx.send('That channel is not a destination.')
+				return
+		await ctx.send(f'Changes won\'t be sent to <#{channel_id}> anymore.')
+	
+	@aru.command()
+	async def stats(self, ctx):
+		"""Show how long each phase of the last checks took and how big the payloads were."""
+		if not self.stats.runs:
+			await ctx.send('No checks were run since the cog was loaded.')
+			return
+		lines = [f'{"Phase":<13}{"Runs":>5}{"p50":>10}{"p95":>10}{"max":>10}']
+		for name, runs, p50, p95, top in self.stats.phase_stats():
+			lines.append(f'{name:<13}{runs:>5}{p50 * 1000:>8.1f}ms{p95 * 1000:>8.1f}ms{top * 1000:>8.1f}ms')
+		lines.append('')
+		lines.append(f'{"Payload":<18}{"last":>10}{"p50":>10}{"max":>10}')
+		for name, last, p50, top in self.stats.size_stats():
+			lines.append(f'{name:<18}{last:>10}{p50:>10}{top:>10}')
+		outcomes = {}
+		for run in self.stats.runs:
+			outcomes[run.outcome] = outcomes.get(run.outcome, 0) + 1
+		summary = ', '.join(f'{count} {outcome}' for outcome, count in outcomes.items())
+		await ctx.send(f'Last {len(self.stats.runs)} checks: {summary}.' + box('\n'.join(lines)))
+	
+	@aru.command()
+	async def history(self, ctx, *, query: str):
+		"""
+		Show when a repo or cog was added, changed or removed.
+		
+		Repos can be given by their name or URL, cogs by their name.
+		"""
+		loop = asyncio.get_running_loop()
+		async with ctx.typing():
+			events = await loop.run_in_executor(None, self.history.changes, query)
+		if not events:
+			await ctx.send('No recorded changes match that repo or cog.')
+			return
+		lines = [f'<t:{int(timestamp)}:f> {line}' for timestamp, line in events]
+		for page in pagify('\n'.join(lines)):
+			await ctx.send(page)
+	
+	@aru.command()
+	async def at(self, ctx, *, when: str):
+		"""
+		Get the cogboard string as it was at the given time.
+		
+		The time should be in ISO 8601 format, e.g. `2023-05-17 14:30`, and is in UTC unless specified.
+		"""
+		try:
+			moment = datetime.fromisoformat(when)
+		except ValueError:
+			await ctx.send('That\'s not a valid ISO 8601 time.')
+			return
+		if moment.tzinfo is None:
+			moment = moment.replace(tzinfo=timezone.utc)
+		loop = asyncio.get_running_loop()
+		async with ctx.typing():
+			snapshot = await loop.run_in_executor(None, self.history.snapshot_at, moment.timestamp())
+			if snapshot is None:
+				await ctx.send('The history doesn\'t go back that far.')
+				return
+			msg = await self._build_string([Repo.from_raw(raw) for raw in snapshot.values()])
+		file = StringIO(msg)
+		file.name = f'result-{moment:%Y%m%d-%H%M}.txt'
+		await ctx.send(file=discord.File(file))
+	
 	@aru.command()
 	async def get(self, ctx):
 		"""Get the string needed to update the approved repository list."""
 		async with ctx.typing():
-			repos = await self._get_repos()
-			msg = await self._build_string(repos)
+			try:
+				response = await self._fetch_index()
+			except IndexFetchError as e:
+				await ctx.send(f'Could not fetch the index: {e}')
+				return
+			msg = None
+			if not response.modified:
+				# an unchanged index is the one the last check processed, so its hash is already known
+				msg = self._cached_cogboard(await self.config.lastHash())
+			if msg is None:
+				repos, _, _, index_hash = await self._load_index(response.body, CheckRun())
+				msg = await self._build_string(repos, index_hash)
 		file = StringIO(msg)
 		file.name = 'result.txt'
 		await ctx.send(file=discord.File(file))
 		self.last_check = time.time()
 		await self.config.last_string.set(msg)
 	
-	async def _get_repos(self):
-		"""Get the Repo objects of approved repos."""
-		repos = []
-		async with aiohttp.ClientSession() as session:
-			async with session.get(CC_INDEX_LINK) as r:
-				if r.status != 200:
-					raise RuntimeError(f'Could not fetch index. HTTP code: {r.status}')
-				raw = await r.json(content_type=None)
-		for url, data in raw.items():
-			repos.append(Repo(url, data))
-		return [r for r in repos if r.approved]
-	
-	async def _build_string(self, repos: list):
-		"""Build the cogboard string from a list of Repos."""
-		master = ''
-		repos = sorted(repos, key=self._sort_repos)
-		for repo in repos:
-			master += f'_____________________________\n**{repo.name}**\nRepo Link: {repo.url}\n'
+	async def _fetch_index(self):
+		"""Fetch the index, sending a conditional request against the last processed index."""
+		timeout = aiohttp.ClientTimeout(
+			total=await self.config.fetch_timeout(),
+			connect=await self.config.fetch_connect_timeout(),
+		)
+		return await self.fetcher.fetch(
+			self.session, timeout=timeout, retries=await self.config.fetch_retries()
+		)
+	
+	@classmethod
+	async def _load_index(cls, body: bytes, run: CheckRun):
+		"""
+		Parse the index and build its snapshot in a worker thread, so the event loop isn't blocked.
+		
+		Returns the approved Repos, their raw data and content hashes keyed by URL, and the index hash.
+		Decode and build times are recorded in `run`.
+		"""
+		loop = asyncio.get_running_loop()
+		return await loop.run_in_executor(None, cls._parse_index, body, run)
+	
+	@classmethod
+	def _parse_index(cls, body: bytes, run: CheckRun):
+		with run.phase('decode'):
+			index = json.loads(body)
+		with run.phase('build'):
+			repos = cls._build_repos(index)
+			snapshot = cls._snapshot_repos(repos)
+		return (repos, *snapshot)
+	
+	@staticmethod
+	def _snapshot_repos(repos: list):
+		"""Get the raw data and content hashes of Repos keyed by URL, and the hash of the whole index."""
+		new_raw = {r.url: r.to_raw() for r in repos}
+		new_hashes = {url: fingerprint_repo(raw) for url, raw in new_raw.items()}
+		return new_raw, new_hashes, fingerprint_index(new_hashes)
+	
+	@staticmethod
+	def _build_repos(index: dict):
+		"""Build the Repo objects of approved repos from the decoded index."""
+		return [
+			Repo(url, data)
+			for url, data in index.items()
+			if data.get("rx_category", "unapproved") == 'approved'
+		]
+	
+	async def _build_string(self, repos: list, index_hash: str = None):
+		"""
+		Build the cogboard string from a list of Repos.
+		
+		When `index_hash` is given, the result is cached and reused while the index doesn't change.
+		"""
+		if (cached := self._cached_cogboard(index_hash)) is not None:
+			return cached
+		parts = []
+		for repo in sorted(repos, key=self._sort_repos):
+			parts.append(f'_____________________________\n**{repo.name}**\nRepo Link: {repo.url}\n')
 			if repo.branch:
-				master += f'Branch: {repo.branch}\n'
-			master += '\n'
+				parts.append(f'Branch: {repo.branch}\n')
+			parts.append('\n')
 			for cog in repo.cogs:
-				master += f'+ {cog.name}: {cog.short}\n'
-			master += '\n'
+				parts.append(f'+ {cog.name}: {cog.short}\n')
+			parts.append('\n')
+		master = ''.join(parts)
+		if index_hash is not None:
+			self._cogboard_cache = (index_hash, master)
 		return master
 
+	def _cached_cogboard(self, index_hash: str = None):
+		"""Get the cached cogboard string of the index with the given hash or `None` if it isn't cached."""
+		if index_hash is not None and self._cogboard_cache[0] == index_hash:
+			return self._cogboard_cache[1]
+		return None
+	
 	@staticmethod
 	def _sort_repos(repos):
 		"""Sort the repos based on the order of application."""
-		try:
-			return SORT_ORDER.index(repos.url)
-		except ValueError:
-			return 999999999999
+		return SORT_POSITIONS.get(repos.url, 999999999999)
 	
-	async def _check_changes(self, new: list):
-		"""Check for changes since the last check and build a diff."""
-		result = {}
-		
-		old = await self.config.lastRaw()
-		if old == [r.to_raw() for r in new]:
-			return result
-		old = [Repo(r['url'], r) for r in old]
+	async def _check_changes(self, new_raw: dict, new_hashes: dict, index_hash: str):
+		"""
+		Check for changes since the last check and build a diff.
 		
-		old_repos = set(r.url for r in old)
-		new_repos = set(r.url for r in new)
-		sum_repos = old_repos & new_repos
-		old_repos -= sum_repos
-		new_repos -= sum_repos
-		
-		result['rem_cogs'] = {}
-		result['add_cogs'] = {}
-		
-		if old_repos:
-			result['rem_repos'] = []
-			for r in old_repos:
-				repo = [x for x in old if x.url == r][0]
-				result['rem_repos'].append(repo)
-				result['rem_cogs'][repo] = repo.cogs
-		if new_repos:
-			result['add_repos'] = []
-			for r in new_repos:
-				repo = [x for x in new if x.url == r][0]
-				result['add_repos'].append(repo)
-				result['add_cogs'][repo] = repo.cogs
-		
-		for new_repo in new:
-			#new repo, already handled
-			if new_repo.url not in sum_repos:
-				continue
-			old_repo = [x for x in old if x.url == new_repo.url][0]
-			
-			old_cogs = set(r.name for r in old_repo.cogs)
-			new_cogs = set(r.name for r in new_repo.cogs)
-			sum_cogs = old_cogs & new_cogs
-			old_cogs -= sum_cogs
-			new_cogs -= sum_cogs
-			
-			if old_cogs:
-				result['rem_cogs'][new_repo] = []
-				for c in old_cogs:
-					cog = [x for x in old_repo.cogs if x.name == c][0]
-					result['rem_cogs'][new_repo].append(cog)
-			if new_cogs:
-				result['add_cogs'][new_repo] = []
-				for c in new_cogs:
-					cog = [x for x in new_repo.cogs if x.name == c][0]
-					result['add_cogs'][new_repo].append(cog)
-				
-		if not result['rem_cogs']:
-			del result['rem_cogs']
-		if not result['add_cogs']:
-			del result['add_cogs']
+		Returns the diff, the URLs of repos whose stored snapshot is outdated,
+		and the stored raw data of those repos keyed by URL.
+		Only the repos whose content hash changed are read from Config and compared.
+		"""
+		if index_hash == await self.config.lastHash():
+			return IndexDiff(), [], {}
+		old_hashes = await self.config.lastHashes()
+		changed = [url for url, h in new_hashes.items() if old_hashes.get(url) != h]
+		removed = [url for url in old_hashes if url not in new_hashes]
+		old = {}
+		for url in changed + removed:
+			if url in old_hashes:
+				old[url] = await self.config.custom('SNAPSHOT', url).all()
+		changes = diff_snapshots(old.values(), [new_raw[url] for url in changed])
+		return changes, changed + removed, old
+	
+	async def _save_snapshot(self, new_raw: dict, new_hashes: dict, index_hash: str, outdated: list):
+		"""Store the new snapshot, only writing the repos that changed."""
+		for url in outdated:
+			if url in new_raw:
+				await self.config.custom('SNAPSHOT', url).set(new_raw[url])
+			else:
+				await self.config.custom('SNAPSHOT', url).clear()
+		await self.config.lastHashes.set(new_hashes)
+		await self.config.lastHash.set(index_hash)
+	
+	async def _record_history(self, new_raw: dict, index_hash: str, outdated: list):
+		"""Append the changed repos to the history, starting it from the stored snapshot if needed."""
+		loop = asyncio.get_running_loop()
+		try:
+			if not self.history.exists():
+				snapshot = await self.config.custom('SNAPSHOT').all()
+				await loop.run_in_executor(None, self.history.initialize, snapshot, self.last_check)
+			changes = {url: new_raw.get(url) for url in outdated}
+			await loop.run_in_executor(None, self.history.record, time.time(), index_hash, changes)
+		except Exception:
+			# the history is optional, it must never stop the snapshot from being saved
+			log.exception('Could not record the change in the history.')
+	
+	async def _scheduler(self):
+		"""Run the check periodically until the cog is unloaded."""
+		await self.bot.wait_until_red_ready()
+		while True:
+			jitter = await self.config.check_jitter()
+			delay = await self._next_check_at() - time.time()
+			if delay > 0:
+				try:
+					await asyncio.wait_for(self._reschedule.wait(), timeout=delay + random.uniform(0, jitter))
+				except asyncio.TimeoutError:
+					pass
+				else:
+					# the interval changed or a check was run manually
+					self._reschedule.clear()
+					continue
+				# the last check might have been moved while we were sleeping
+				if time.time() < await self._next_check_at():
+					continue
+			try:
+				await self._run_check()
+			except Exception:
+				log.exception('Check failed.')
+	
+	async def _next_check_at(self):
+		"""Get the time of the next scheduled check, held changes are checked on when their quiet window ends."""
+		next_check = self.last_check + await self.config.check_interval()
+		pending_since = await self.config.pendingSince()
+		if pending_since is not None:
+			flush_at = max(
+				pending_since + await self.config.quiet_window() * 60,
+				self.last_check + PENDING_RETRY_DELAY,
+			)
+			next_check = min(next_check, flush_at)
+		return next_check
+	
+	async def _run_check(self):
+		"""
+		Check the index for changes and send the diff if there are any.
 		
-		return result
+		Only one check runs at a time. Returns whether the cogboard needs to be updated.
+		"""
+		async with self._check_lock:
+			lag = LoopLagMonitor()
+			run = CheckRun()
+			try:
+				async with lag:
+					changed = await self._check(run)
+			except Exception:
+				run.finish('failed')
+				raise
+			else:
+				run.finish('changed' if changed else run.outcome or 'unchanged')
+				return changed
+			finally:
+				self.stats.record(run)
+				log.info(
+					'Event loop lag during check: max %.1fms, mean %.1fms.',
+					lag.max_lag * 1000, lag.mean_lag * 1000,
+				)
+				self._reschedule.set()
 	
-	@commands.Cog.listener()
-	async def on_message(self, message):
-		if time.time() < self.last_check + 3600:
-			return
+	async def _check(self, run: CheckRun):
 		self.last_check = time.time()
-		ts = lambda: time.strftime('%I:%M:%S %p', time.localtime())
-		print(f'[{ts()}] [ApprovedUpdater] Started check.')
-		repos = await self._get_repos()
-		changes = await self._check_changes(repos)
-		print(f'[{ts()}] [ApprovedUpdater] Finished check. Took {round(time.time() - self.last_check, 2)} seconds.')
+		log.info('Started check.')
+		try:
+			with run.phase('fetch'):
+				response = await self._fetch_index()
+		except IndexFetchError as e:
+			log.warning('Check failed. %s', e)
+			run.outcome = 'fetch failed'
+			return False
+		if not response.modified:
+			run.outcome = 'not modified'
+			return await self._flush_changes(run)
+		run.sizes['payload_bytes'] = len(response.body)
+		repos, new_raw, new_hashes, index_hash = await self._load_index(response.body, run)
+		run.sizes['repos'] = len(repos)
+		run.sizes['cogs'] = sum(len(r.cogs) for r in repos)
+		with run.phase('diff'):
+			changes, outdated, old_raw = await self._check_changes(new_raw, new_hashes, index_hash)
+		with run.phase('config_write'):
+			if outdated:
+				# the history is started from the stored snapshot, so it has to be recorded first
+				await self._record_history(new_raw, index_hash, outdated)
+				await self._save_snapshot(new_raw, new_hashes, index_hash, outdated)
+			self.fetcher.commit(response)
+		if changes:
+			if not await self.config.quiet_window() and not await self.config.pendingBase():
+				return await self._publish(run, changes)
+			await self._hold_changes(old_raw, outdated)
+		return await self._flush_changes(run)
+	
+	async def _hold_changes(self, old_raw: dict, outdated: list):
+		"""
+		Hold the changes until the index stops changing.
+		
+		Only the state of changed repos from before the first held change is kept,
+		the net diff is computed against the current snapshot when the changes are sent.
+		"""
+		async with self.config.pendingBase() as pending:
+			for url in outdated:
+				if url not in pending:
+					# `None` marks a repo that didn't exist before
+					pending[url] = old_raw.get(url)
+		await self.config.pendingSince.set(time.time())
+	
+	async def _flush_changes(self, run: CheckRun):
+		"""Send the held changes if the index didn't change during the quiet window."""
+		pending = await self.config.pendingBase()
+		if not pending:
+			return False
+		pending_since = await self.config.pendingSince()
+		if time.time() < pending_since + await self.config.quiet_window() * 60:
+			run.outcome = 'held'
+			return False
+		with run.phase('diff'):
+			old = [raw for raw in pending.values() if raw is not None]
+			new = []
+			for url in pending:
+				# repos that were removed have no stored snapshot
+				raw = await self.config.custom('SNAPSHOT', url).all()
+				if raw:
+					new.append(raw)
+			changes = diff_snapshots(old, new)
+		await self.config.pendingBase.set({})
+		await self.config.pendingSince.clear()
 		if not changes:
-			return
-		last = await self.config.lastRaw.set([r.to_raw() for r in repos])
-		diff = ''
-		if 'add_repos' in changes:
-			diff += '\nAdded repos\n-----------\n'
-			for repo in changes['add_repos']:
-				diff += f'+ {repo.name} - {repo.short}\n{repo.url}\n'
-		if 'rem_repos' in changes:
-			diff += '\nRemoved repos\n-------------\n'
-			for repo in changes['rem_repos']:
-				diff += f'- {repo.name} - {repo.short}\n'
-		if 'add_cogs' in changes:
-			diff += '\nAdded cogs\n----------\n'
-			for repo in changes['add_cogs']:
-				diff += f'{repo.name}:\n'
-				for cog in changes['add_cogs'][repo]:
-					diff += f'+ {cog.name} - {cog.short}\n'
-		if 'rem_cogs' in changes:
-			diff += '\nRemoved cogs\n------------\n'
-			for repo in changes['rem_cogs']:
-				diff += f'{repo.name}:\n'
-				for cog in changes['rem_cogs'][repo]:
-					diff += f'- {cog.name} - {cog.short}\n'
+			# e.g. a cog was added and removed again
+			run.outcome = 'cancelled out'
+			return False
+		return await self._publish(run, changes)
+	
+	async def _publish(self, run: CheckRun, changes: IndexDiff):
+		"""Render the changes and send them to all destinations."""
+		with run.phase('render'):
+			lines = list(diff_lines(changes))
+		run.sizes['diff_chars'] = sum(map(len, lines))
+		log.info('Update required!\n%s', ''.join(lines))
 
-		channel = self.bot.get_channel(598626368665813005)
-		print(f'[{ts()}] [ApprovedUpdater] Update required!\n')
-		print(diff)
-		diff = diff[:1954]
-		await channel.send(f'The cogboard needs to be updated!\n```diff\n{diff}```'[:2000])
-		cog_server_channel = self.bot.get_channel(723262416766500937)
-		m = await cog_server_channel.send(f'```diff\n{diff}```'[:2000])
-		await m.publish()
+		with run.phase('publish'):
+			destinations = await self.config.destinations()
+			failed = await publish_changes(
+				self.bot, destinations, changes, concurrency=await self.config.publish_concurrency(),
+				rendered={'full': lines},
+			)
+		run.sizes['destinations'] = len(destinations)
+		if failed:
+			log.warning('The changes could not be sent to %s of %s destinations.', len(failed), len(destinations))
+		return True
@@ -0,0 +1,108 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Tuple
+
+# fields compared between the old and the new version of a repo/cog
+REPO_FIELDS = ('name', 'short', 'description', 'branch', 'author')
+COG_FIELDS = ('short', 'description', 'author')
+
+
+@dataclass
+class RepoDiff:
+	"""Changes of a single repo between two snapshots."""
+	url: str
+	name: str
+	added_cogs: List[dict] = field(default_factory=list)
+	removed_cogs: List[dict] = field(default_factory=list)
+	# {FIELD: (OLD_VALUE, NEW_VALUE)}
+	fields: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+	# {COG_NAME: {FIELD: (OLD_VALUE, NEW_VALUE)}}
+	cog_fields: Dict[str, Dict[str, Tuple[Any, Any]]] = field(default_factory=dict)
+
+	def __bool__(self):
+		return bool(self.added_cogs or self.removed_cogs or self.fields or self.cog_fields)
+
+
+@dataclass
+class IndexDiff:
+	"""
+	Changes between two snapshots of the approved repos.
+
+	`repos` holds a `RepoDiff` for every repo that changed, including added and removed repos,
+	whose cogs are listed as added or removed respectively.
+	"""
+	added_repos: List[dict] = field(default_factory=list)
+	removed_repos: List[dict] = field(default_factory=list)
+	repos: List[RepoDiff] = field(default_factory=list)
+
+	def __bool__(self):
+		return bool(self.repos)
+
+
+def _diff_fields(old: dict, new: dict, fields: Iterable[str]) -> Dict[str, Tuple[Any, Any]]:
+	changes = {}
+	for name in fields:
+		old_value = old.get(name)
+		new_value = new.get(name)
+		if old_value != new_value:
+			changes[name] = (old_value, new_value)
+	return changes
+
+
+def diff_repo(old: dict, new: dict) -> RepoDiff:
+	"""Compare two raw versions of the same repo."""
+	result = RepoDiff(new['url'], new['name'], fields=_diff_fields(old, new, REPO_FIELDS))
+	old_cogs = {c['name']: c for c in old['rx_cogs']}
+	new_cogs = {c['name']: c for c in new['rx_cogs']}
+	for name, new_cog in new_cogs.items():
+		old_cog = old_cogs.get(name)
+		if old_cog is None:
+			result.added_cogs.append(new_cog)
+			continue
+		changes = _diff_fields(old_cog, new_cog, COG_FIELDS)
+		if changes:
+			result.cog_fields[name] = changes
+	for name, old_cog in old_cogs.items():
+		if name not in new_cogs:
+			result.removed_cogs.append(old_cog)
+	return result
+
+
+def diff_snapshots(old: Iterable[dict], new: Iterable[dict]) -> IndexDiff:
+	"""
+	Compare two snapshots made of raw repos (as returned by `Repo.to_raw()`).
+
+	Repos are matched by their URL and cogs by their name, so this runs in linear time.
+	"""
+	result = IndexDiff()
+	old_repos = {r['url']: r for r in old}
+	new_repos = {r['url']: r for r in new}
+	for url, new_repo in new_repos.items():
+		old_repo = old_repos.get(url)
+		if old_repo is None:
+			result.added_repos.append(new_repo)
+			result.repos.append(RepoDiff(url, new_repo['name'], added_cogs=list(new_repo['rx_cogs'])))
+			continue
+		repo_diff = diff_repo(old_repo, new_repo)
+		if repo_diff:
+			result.repos.append(repo_diff)
+	for url, old_repo in old_repos.items():
+		if url not in new_repos:
+			result.removed_repos.append(old_repo)
+			result.repos.append(RepoDiff(url, old_repo['name'], removed_cogs=list(old_repo['rx_cogs'])))
+	return result
+
+
+def fingerprint_repo(raw: dict) -> str:
+	"""Get a stable content hash of a raw repo."""
+	data = json.dumps(raw, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+	return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+def fingerprint_index(hashes: Dict[str, str]) -> str:
+	"""Get a stable content hash of a whole snapshot from the hashes of its repos, keyed by URL."""
+	digest = hashlib.sha1()
+	for url in sorted(hashes):
+		digest.update(f'{url}\0{hashes[url]}\n'.encode('utf-8'))
+	return digest.hexdigest()
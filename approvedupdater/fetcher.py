@@ -0,0 +1,147 @@
+import asyncio
+import json
+import random
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import aiohttp
+
+from .storage import atomic_write
+
+
+# statuses worth retrying, anything else is treated as a permanent failure
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class IndexFetchError(RuntimeError):
+	"""Raised when the index couldn't be fetched."""
+
+
+class IndexResponse(NamedTuple):
+	"""Result of fetching the index."""
+	body: bytes
+	modified: bool
+	etag: Optional[str]
+	last_modified: Optional[str]
+
+
+class IndexFetcher:
+	"""
+	Fetches the Red-Index using conditional requests.
+
+	The validators (ETag/Last-Modified) and the body of the last processed index are kept on disk,
+	so fetching an index that didn't change only costs a 304 response.
+	"""
+
+	def __init__(self, url: str, cache_dir: Path):
+		self.url = url
+		self.meta_path = cache_dir / 'index_meta.json'
+		self.body_path = cache_dir / 'index.json'
+		self._meta = self._load_meta()
+
+	def _load_meta(self) -> dict:
+		# validators are worthless without the body they belong to
+		if not self.body_path.is_file():
+			return {}
+		try:
+			with self.meta_path.open(encoding='utf-8') as f:
+				return json.load(f)
+		except (OSError, ValueError):
+			return {}
+
+	def cached_body(self) -> Optional[bytes]:
+		"""Get the body of the last processed index or `None` if there isn't one."""
+		try:
+			return self.body_path.read_bytes()
+		except OSError:
+			return None
+
+	async def fetch(
+		self,
+		session: aiohttp.ClientSession,
+		*,
+		conditional: bool = True,
+		timeout: Optional[aiohttp.ClientTimeout] = None,
+		retries: int = 3,
+		backoff: float = 1.0,
+		max_backoff: float = 30.0,
+	) -> IndexResponse:
+		"""
+		Fetch the index.
+
+		When `conditional` is True and the index didn't change since the last committed fetch,
+		the cached body is returned and `modified` is False.
+
+		Timeouts, connection errors and server errors are retried up to `retries` times
+		with exponential backoff capped at `max_backoff` seconds.
+		Raises `IndexFetchError` if the index couldn't be fetched.
+		"""
+		attempt = 0
+		while True:
+			try:
+				return await self._fetch_once(session, conditional, timeout)
+			except _RetryableError as e:
+				if attempt >= retries:
+					raise IndexFetchError(f'Could not fetch index after {attempt + 1} attempts: {e}') from e
+				delay = min(backoff * 2 ** attempt, max_backoff)
+				if e.retry_after is not None:
+					delay = min(max(delay, e.retry_after), max_backoff)
+				await asyncio.sleep(random.uniform(delay / 2, delay))
+				attempt += 1
+
+	async def _fetch_once(self, session, conditional, timeout) -> IndexResponse:
+		headers = {}
+		if conditional:
+			if self._meta.get('etag'):
+				headers['If-None-Match'] = self._meta['etag']
+			if self._meta.get('last_modified'):
+				headers['If-Modified-Since'] = self._meta['last_modified']
+		kwargs = {} if timeout is None else {'timeout': timeout}
+		try:
+			async with session.get(self.url, headers=headers, **kwargs) as r:
+				if r.status == 304:
+					body = self.cached_body()
+					if body is not None:
+						return IndexResponse(body, False, self._meta.get('etag'), self._meta.get('last_modified'))
+				elif r.status in RETRY_STATUSES:
+					raise _RetryableError(f'HTTP code: {r.status}', _parse_retry_after(r.headers))
+				elif r.status != 200:
+					raise IndexFetchError(f'Could not fetch index. HTTP code: {r.status}')
+				else:
+					return IndexResponse(
+						await r.read(), True, r.headers.get('ETag'), r.headers.get('Last-Modified')
+					)
+		except asyncio.TimeoutError as e:
+			raise _RetryableError('timed out') from e
+		except aiohttp.ClientError as e:
+			raise _RetryableError(f'{type(e).__name__}: {e}') from e
+		# the cached body disappeared after we sent the conditional request
+		self._meta = {}
+		return await self._fetch_once(session, False, timeout)
+
+	def commit(self, response: IndexResponse):
+		"""
+		Mark the given response as processed.
+
+		Later conditional fetches will be compared against this response.
+		"""
+		if not response.modified:
+			return
+		self.body_path.parent.mkdir(parents=True, exist_ok=True)
+		meta = {'etag': response.etag, 'last_modified': response.last_modified}
+		atomic_write(self.body_path, response.body)
+		atomic_write(self.meta_path, json.dumps(meta).encode('utf-8'))
+		self._meta = meta
+
+
+class _RetryableError(Exception):
+	def __init__(self, message: str, retry_after: Optional[float] = None):
+		super().__init__(message)
+		self.retry_after = retry_after
+
+
+def _parse_retry_after(headers) -> Optional[float]:
+	try:
+		return float(headers['Retry-After'])
+	except (KeyError, ValueError):
+		return None
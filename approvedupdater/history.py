@@ -0,0 +1,221 @@
+import bisect
+import json
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from .diff import diff_repo
+from .storage import atomic_write
+
+# record length prefix of the log
+_LENGTH = struct.Struct('>I')
+
+
+def _compress(obj) -> bytes:
+	return zlib.compress(json.dumps(obj, separators=(',', ':')).encode('utf-8'), 9)
+
+
+def _decompress(data: bytes):
+	return json.loads(zlib.decompress(data))
+
+
+def _apply(snapshot: dict, changes: dict):
+	for url, raw in changes.items():
+		if raw is None:
+			snapshot.pop(url, None)
+		else:
+			snapshot[url] = raw
+
+
+class HistoryStore:
+	"""
+	Append-only history of the approved repos snapshot, kept in `directory`.
+
+	- `base.zlib` holds the snapshot (`{URL: RAW_REPO}`) the current log starts from.
+	- `log.bin` holds the deltas recorded since then, each a length-prefixed zlib-compressed
+	  record `{'t': TIMESTAMP, 'h': INDEX_HASH, 'c': {URL: RAW_REPO or None}}`,
+	  so recording a change only appends data proportional to the repos that changed.
+	- `segments/` holds compacted logs, each stored with the snapshot it starts from
+	  and compressed as a whole, which compresses much better than separate records.
+
+	Reconstructing a snapshot only needs the segment covering the requested time.
+	"""
+
+	def __init__(self, directory: Path, compact_every: int = 200):
+		self.directory = directory
+		self.compact_every = compact_every
+		self.base_path = directory / 'base.zlib'
+		self.log_path = directory / 'log.bin'
+		self.segments_dir = directory / 'segments'
+		# number of records in the log, counted on first use
+		self._log_records = None
+
+	def exists(self) -> bool:
+		return self.base_path.is_file()
+
+	def initialize(self, snapshot: dict, timestamp: float):
+		"""Start the history from the given snapshot."""
+		self.segments_dir.mkdir(parents=True, exist_ok=True)
+		atomic_write(self.base_path, _compress({'t': timestamp, 'snapshot': snapshot}))
+		atomic_write(self.log_path, b'')
+		self._log_records = 0
+
+	def record(self, timestamp: float, index_hash: str, changes: dict):
+		"""
+		Append a delta made of the new raw data of changed repos and `None` for removed ones.
+
+		The log is compacted into a segment once it holds `compact_every` records.
+		"""
+		if self._log_records is None:
+			# appending after an incomplete record would make the new one unreadable too
+			self._log_records = self._repair_log()
+		data = _compress({'t': timestamp, 'h': index_hash, 'c': changes})
+		with self.log_path.open('ab') as f:
+			f.write(_LENGTH.pack(len(data)) + data)
+			f.flush()
+			os.fsync(f.fileno())
+		self._log_records += 1
+		if self._log_records >= self.compact_every:
+			self.compact()
+
+	def compact(self):
+		"""Move the current log into a segment and start a new log from the latest snapshot."""
+		base = self._load_base()
+		deltas = list(self._read_log(base['t']))
+		if not deltas:
+			return
+		segment = {'t': base['t'], 'snapshot': base['snapshot'], 'deltas': deltas}
+		name = f'{int(base["t"] * 1000):015d}.zlib'
+		atomic_write(self.segments_dir / name, _compress(segment))
+		snapshot = base['snapshot']
+		for delta in deltas:
+			_apply(snapshot, delta['c'])
+		# deltas older than the base are skipped, so a crash before the log is emptied is harmless
+		atomic_write(self.base_path, _compress({'t': deltas[-1]['t'], 'snapshot': snapshot}))
+		atomic_write(self.log_path, b'')
+		self._log_records = 0
+
+	def snapshot_at(self, timestamp: float) -> Optional[dict]:
+		"""
+		Get the snapshot as it was at the given time.
+
+		Returns `None` if the history doesn't go back that far.
+		"""
+		if not self.exists():
+			return None
+		base = self._load_base()
+		if timestamp >= base['t']:
+			snapshot, deltas = base['snapshot'], self._read_log(base['t'])
+		else:
+			# only the segment covering the requested time is read
+			paths = self._segment_paths()
+			idx = bisect.bisect_right([int(path.stem) for path in paths], timestamp * 1000) - 1
+			if idx < 0:
+				return None
+			segment = _decompress(paths[idx].read_bytes())
+			snapshot, deltas = segment['snapshot'], segment['deltas']
+		for delta in deltas:
+			if delta['t'] > timestamp:
+				break
+			_apply(snapshot, delta['c'])
+		return snapshot
+
+	def changes(self, query: str) -> List[Tuple[float, str]]:
+		"""
+		Get the change log of repos and cogs matching the query, oldest first.
+
+		Repos match by their URL or name, cogs by their name (case-insensitive).
+		"""
+		query = query.lower()
+		events = []
+		for _, snapshot, deltas in self._iter_chunks():
+			for delta in deltas:
+				for url, new in delta['c'].items():
+					old = snapshot.get(url)
+					events.extend((delta['t'], line) for line in self._describe(url, old, new, query))
+				_apply(snapshot, delta['c'])
+		return events
+
+	@staticmethod
+	def _describe(url: str, old: Optional[dict], new: Optional[dict], query: str) -> Iterator[str]:
+		repo = new or old
+		repo_matches = query in (url.lower(), repo['name'].lower())
+		if old is None or new is None:
+			action = 'added' if old is None else 'removed'
+			cogs = [c['name'] for c in repo['rx_cogs']]
+			if repo_matches:
+				yield f'Repo {repo["name"]} {action} with cogs: {", ".join(cogs) or "none"}'
+			else:
+				for cog in cogs:
+					if cog.lower() == query:
+						yield f'Cog {cog} {action} with repo {repo["name"]}'
+			return
+		repo_diff = diff_repo(old, new)
+		if repo_matches and repo_diff.fields:
+			yield f'Repo {repo["name"]} changed: {", ".join(repo_diff.fields)}'
+		for cog in repo_diff.added_cogs:
+			if repo_matches or cog['name'].lower() == query:
+				yield f'Cog {cog["name"]} added to {repo["name"]}'
+		for cog in repo_diff.removed_cogs:
+			if repo_matches or cog['name'].lower() == query:
+				yield f'Cog {cog["name"]} removed from {repo["name"]}'
+		for cog_name, fields in repo_diff.cog_fields.items():
+			if repo_matches or cog_name.lower() == query:
+				yield f'Cog {cog_name} in {repo["name"]} changed: {", ".join(fields)}'
+
+	def _iter_chunks(self) -> Iterator[Tuple[float, dict, List[dict]]]:
+		"""Yield (START, SNAPSHOT, DELTAS) of every segment and then of the current log."""
+		for path in self._segment_paths():
+			segment = _decompress(path.read_bytes())
+			yield segment['t'], segment['snapshot'], segment['deltas']
+		if self.exists():
+			base = self._load_base()
+			yield base['t'], base['snapshot'], list(self._read_log(base['t']))
+
+	def _segment_paths(self) -> List[Path]:
+		# names are zero-padded start times, so they sort chronologically
+		return sorted(self.segments_dir.glob('*.zlib'))
+
+	def _load_base(self) -> dict:
+		return _decompress(self.base_path.read_bytes())
+
+	def _read_log(self, after: float) -> Iterator[dict]:
+		try:
+			data = self.log_path.read_bytes()
+		except FileNotFoundError:
+			return
+		offset = 0
+		while offset + _LENGTH.size <= len(data):
+			(length,) = _LENGTH.unpack_from(data, offset)
+			offset += _LENGTH.size
+			if offset + length > len(data):
+				# incomplete record of an interrupted write
+				break
+			delta = _decompress(data[offset:offset + length])
+			offset += length
+			if delta['t'] > after:
+				yield delta
+
+	def _repair_log(self) -> int:
+		"""Cut off an incomplete record left by an interrupted write and get the number of complete records."""
+		try:
+			data = self.log_path.read_bytes()
+		except FileNotFoundError:
+			return 0
+		offset = 0
+		count = 0
+		while offset + _LENGTH.size <= len(data):
+			(length,) = _LENGTH.unpack_from(data, offset)
+			end = offset + _LENGTH.size + length
+			if end > len(data):
+				break
+			offset = end
+			count += 1
+		if offset < len(data):
+			with self.log_path.open('r+b') as f:
+				f.truncate(offset)
+				f.flush()
+				os.fsync(f.fileno())
+		return count
@@ -0,0 +1,42 @@
+import asyncio
+
+
+class LoopLagMonitor:
+	"""
+	Measures how long the event loop is blocked.
+
+	A background task sleeps for `interval` seconds in a loop and records how late it wakes up.
+	Use as an async context manager around the code that should be measured.
+	"""
+
+	def __init__(self, interval: float = 0.01):
+		self.interval = interval
+		self.samples = 0
+		self.total_lag = 0.0
+		self.max_lag = 0.0
+		self._task = None
+
+	@property
+	def mean_lag(self) -> float:
+		return self.total_lag / self.samples if self.samples else 0.0
+
+	async def __aenter__(self):
+		self._task = asyncio.create_task(self._run())
+		return self
+
+	async def __aexit__(self, *exc_info):
+		self._task.cancel()
+		try:
+			await self._task
+		except asyncio.CancelledError:
+			pass
+
+	async def _run(self):
+		loop = asyncio.get_running_loop()
+		while True:
+			start = loop.time()
+			await asyncio.sleep(self.interval)
+			lag = max(loop.time() - start - self.interval, 0.0)
+			self.samples += 1
+			self.total_lag += lag
+			self.max_lag = max(self.max_lag, lag)
@@ -0,0 +1,97 @@
+import asyncio
+import itertools
+from io import StringIO
+from typing import List
+
+import discord
+
+from .diff import IndexDiff
+from .render import chunk_lines, diff_lines, summary_lines
+from .telemetry import log
+
+MESSAGE_LIMIT = 2000
+CODE_BLOCK = '```diff\n{}```'
+# {FORMAT: RENDERER}
+FORMATS = {'full': diff_lines, 'summary': summary_lines}
+
+
+async def send_diff(
+	channel: discord.abc.Messageable,
+	lines: List[str],
+	*,
+	header: str = '',
+	max_messages: int = 5,
+	publish: bool = False,
+	pacing: float = 1.0,
+):
+	"""
+	Send the rendered diff lines to the channel as code blocks split on line boundaries.
+
+	The diff is split over up to `max_messages` messages, a longer diff is sent as a file instead.
+	When `publish` is set, every sent message is published to the channels following the news channel,
+	with at least `pacing` seconds between messages, as publishing is heavily rate limited.
+	"""
+	limit = MESSAGE_LIMIT - len(header) - len(CODE_BLOCK.format(''))
+	# one chunk more than allowed is enough to know the diff doesn't fit
+	chunks = list(itertools.islice(chunk_lines(lines, limit), max_messages + 1))
+	if len(chunks) > max_messages:
+		file = StringIO(''.join(lines))
+		file.name = 'diff.txt'
+		messages = [(f'{header}The diff is too long, see the attached file.', discord.File(file))]
+	else:
+		messages = [
+			((header if not idx else '') + CODE_BLOCK.format(chunk), None)
+			for idx, chunk in enumerate(chunks)
+		]
+
+	for idx, (content, file) in enumerate(messages):
+		if idx and publish:
+			await asyncio.sleep(pacing)
+		message = await channel.send(content, file=file)
+		if not publish:
+			continue
+		try:
+			await message.publish()
+		except discord.RateLimited as e:
+			log.warning('Publishing in #%s is rate limited for %.0f seconds, skipping.', channel, e.retry_after)
+			publish = False
+
+
+async def publish_changes(
+	bot, destinations: dict, changes: IndexDiff, *, concurrency: int = 5, rendered: dict = None
+):
+	"""
+	Send the changes to all destinations, at most `concurrency` of them at once.
+
+	`destinations` maps channel IDs to their settings (`format`, `header`, and `publish`).
+	Every format is rendered once and shared by all destinations using it,
+	`rendered` can hold lines that were already rendered, keyed by their format.
+	A failing destination is logged and doesn't affect the others.
+
+	Returns the IDs of destinations the changes couldn't be sent to.
+	"""
+	rendered = dict(rendered or {})
+	for settings in destinations.values():
+		if settings['format'] not in rendered:
+			rendered[settings['format']] = list(FORMATS[settings['format']](changes))
+	semaphore = asyncio.Semaphore(concurrency)
+
+	async def send(channel_id: str, settings: dict) -> bool:
+		channel = bot.get_channel(int(channel_id))
+		if channel is None:
+			log.warning('Destination channel %s was not found.', channel_id)
+			return False
+		# only messages in news channels can be published
+		publish = settings['publish'] and isinstance(channel, discord.TextChannel) and channel.is_news()
+		async with semaphore:
+			try:
+				await send_diff(
+					channel, rendered[settings['format']], header=settings['header'], publish=publish
+				)
+			except Exception:
+				log.exception('Could not send the changes to #%s (%s).', channel, channel_id)
+				return False
+		return True
+
+	results = await asyncio.gather(*(send(channel_id, settings) for channel_id, settings in destinations.items()))
+	return [channel_id for channel_id, sent in zip(destinations, results) if not sent]
@@ -0,0 +1,103 @@
+from typing import Iterable, Iterator
+
+from .diff import IndexDiff
+
+
+def _format_field(value):
+	if isinstance(value, list):
+		return ', '.join(value)
+	return value
+
+
+def diff_lines(changes: IndexDiff) -> Iterator[str]:
+	"""Render the changes found by a check as a stream of lines, each ending with a newline."""
+	if changes.added_repos:
+		yield '\n'
+		yield 'Added repos\n'
+		yield '-----------\n'
+		for repo in changes.added_repos:
+			yield f'+ {repo["name"]} - {repo["short"]}\n'
+			yield f'{repo["url"]}\n'
+	if changes.removed_repos:
+		yield '\n'
+		yield 'Removed repos\n'
+		yield '-------------\n'
+		for repo in changes.removed_repos:
+			yield f'- {repo["name"]} - {repo["short"]}\n'
+	changed_repos = [r for r in changes.repos if r.fields]
+	if changed_repos:
+		yield '\n'
+		yield 'Changed repos\n'
+		yield '-------------\n'
+		for repo in changed_repos:
+			yield f'{repo.name}:\n'
+			for name, (old, new) in repo.fields.items():
+				yield f'  {name}: {_format_field(old)} -> {_format_field(new)}\n'
+	added_cogs = [r for r in changes.repos if r.added_cogs]
+	if added_cogs:
+		yield '\n'
+		yield 'Added cogs\n'
+		yield '----------\n'
+		for repo in added_cogs:
+			yield f'{repo.name}:\n'
+			for cog in repo.added_cogs:
+				yield f'+ {cog["name"]} - {cog["short"]}\n'
+	removed_cogs = [r for r in changes.repos if r.removed_cogs]
+	if removed_cogs:
+		yield '\n'
+		yield 'Removed cogs\n'
+		yield '------------\n'
+		for repo in removed_cogs:
+			yield f'{repo.name}:\n'
+			for cog in repo.removed_cogs:
+				yield f'- {cog["name"]} - {cog["short"]}\n'
+	changed_cogs = [r for r in changes.repos if r.cog_fields]
+	if changed_cogs:
+		yield '\n'
+		yield 'Changed cogs\n'
+		yield '------------\n'
+		for repo in changed_cogs:
+			yield f'{repo.name}:\n'
+			for cog_name, fields in repo.cog_fields.items():
+				for name, (old, new) in fields.items():
+					yield f'  {cog_name} {name}: {_format_field(old)} -> {_format_field(new)}\n'
+
+
+def summary_lines(changes: IndexDiff) -> Iterator[str]:
+	"""Render a short summary of the changes found by a check, with counts instead of every change."""
+	counts = (
+		('repos added', len(changes.added_repos)),
+		('repos removed', len(changes.removed_repos)),
+		('repos changed', sum(1 for r in changes.repos if r.fields)),
+		('cogs added', sum(len(r.added_cogs) for r in changes.repos)),
+		('cogs removed', sum(len(r.removed_cogs) for r in changes.repos)),
+		('cogs changed', sum(len(r.cog_fields) for r in changes.repos)),
+	)
+	yield ', '.join(f'{count} {name}' for name, count in counts if count) + '\n'
+	for repo in changes.added_repos:
+		yield f'+ {repo["name"]}\n'
+	for repo in changes.removed_repos:
+		yield f'- {repo["name"]}\n'
+
+
+def chunk_lines(lines: Iterable[str], limit: int) -> Iterator[str]:
+	"""
+	Join lines into chunks of at most `limit` characters, splitting only on line boundaries.
+
+	Lines that are longer than `limit` on their own are split into several chunks.
+	Lines are pulled from `lines` only as needed to fill the next chunk.
+	"""
+	parts = []
+	size = 0
+	for line in lines:
+		if size + len(line) > limit and parts:
+			yield ''.join(parts)
+			parts = []
+			size = 0
+		while len(line) > limit:
+			yield line[:limit]
+			line = line[limit:]
+		parts.append(line)
+		size += len(line)
+	if parts:
+		yield ''.join(parts)
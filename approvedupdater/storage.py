@@ -0,0 +1,12 @@
+import os
+from pathlib import Path
+
+
+def atomic_write(path: Path, data: bytes):
+	"""Write the data to the file so that it holds either the old or the new content, even after a crash."""
+	tmp_path = path.with_name(path.name + '.tmp')
+	with tmp_path.open('wb') as f:
+		f.write(data)
+		f.flush()
+		os.fsync(f.fileno())
+	os.replace(tmp_path, path)
@@ -0,0 +1,85 @@
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+
+log = logging.getLogger('red.cogsupport-cogs.approvedupdater')
+
+# in the order they run during a check
+PHASES = ('fetch', 'decode', 'build', 'diff', 'render', 'config_write', 'publish')
+
+
+class CheckRun:
+	"""
+	Phase timings and payload sizes of a single check.
+
+	Phases that didn't run during the check (e.g. because the index wasn't modified) are missing.
+	"""
+
+	def __init__(self):
+		self.started_at = time.time()
+		self.outcome = None
+		# {PHASE: SECONDS}
+		self.phases = {}
+		# {NAME: SIZE}, e.g. payload bytes or number of repos
+		self.sizes = {}
+		self._start = time.perf_counter()
+		self.total = 0.0
+
+	@contextmanager
+	def phase(self, name: str):
+		start = time.perf_counter()
+		try:
+			yield
+		finally:
+			self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+	def finish(self, outcome: str):
+		self.outcome = outcome
+		self.total = time.perf_counter() - self._start
+
+	def summary(self):
+		phases = ', '.join(f'{name} {self.phases[name] * 1000:.1f}ms' for name in PHASES if name in self.phases)
+		sizes = ', '.join(f'{name} {size}' for name, size in self.sizes.items())
+		return f'Check {self.outcome} in {self.total * 1000:.1f}ms ({phases or "no phases"}). {sizes}'.rstrip()
+
+
+def percentile(values: list, pct: float):
+	"""Nearest-rank percentile of a non-empty list of values."""
+	ordered = sorted(values)
+	rank = max(int(round(pct / 100 * len(ordered))), 1)
+	return ordered[min(rank, len(ordered)) - 1]
+
+
+class CheckStats:
+	"""Ring buffer of the last `maxlen` check runs."""
+
+	def __init__(self, maxlen: int = 100):
+		self.runs = deque(maxlen=maxlen)
+
+	def record(self, run: CheckRun):
+		self.runs.append(run)
+		log.info(run.summary())
+
+	def phase_stats(self):
+		"""Get (PHASE, RUNS, P50, P95, MAX) for every phase that ran at least once, in seconds."""
+		stats = []
+		for name in (*PHASES, 'total'):
+			if name == 'total':
+				values = [run.total for run in self.runs]
+			else:
+				values = [run.phases[name] for run in self.runs if name in run.phases]
+			if values:
+				stats.append((name, len(values), percentile(values, 50), percentile(values, 95), max(values)))
+		return stats
+
+	def size_stats(self):
+		"""Get (NAME, LAST, P50, MAX) for every recorded payload size."""
+		names = {}
+		for run in self.runs:
+			names.update(dict.fromkeys(run.sizes))
+		stats = []
+		for name in names:
+			values = [run.sizes[name] for run in self.runs if name in run.sizes]
+			stats.append((name, values[-1], percentile(values, 50), max(values)))
+		return stats
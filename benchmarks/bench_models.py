@@ -0,0 +1,75 @@
+"""
+Memory benchmark of the approvedupdater models.
+
+Compares the slotted `Repo`/`Cog` models against the previous dict-backed ones
+by building two snapshots of a synthetic index, like a check holds during a diff.
+
+Run from the repository root with: python -m benchmarks.bench_models [COG_COUNT ...]
+"""
+import json
+import sys
+import tracemalloc
+
+from approvedupdater.approvedupdater import Repo
+
+from .synthetic_index import generate_index_bytes
+
+
+class _DictRepo:
+	"""The dict-backed repo model approvedupdater used before, kept as the reference."""
+	def __init__(self, url, raw_data):
+		self.url = url
+		self.approved = 'approved' == raw_data.get("rx_category", "unapproved")
+		self.author = raw_data.get("author", ["Unknown"])
+		self.description = raw_data.get("description", "")
+		self.short = raw_data.get("short", "")
+		self.name = raw_data.get("name", "Unknown")
+		self.branch = raw_data.get("rx_branch", "")
+		self.cogs = []
+		if isinstance(raw_data["rx_cogs"], dict):
+			for cog_name, cog_raw in raw_data["rx_cogs"].items():
+				if cog_raw.get("hidden", False) or cog_raw.get("disabled", False):
+					continue
+				self.cogs.append(_DictCog(cog_name, self, cog_raw))
+		else:
+			for data in raw_data["rx_cogs"]:
+				self.cogs.append(_DictCog(data['name'], self, data))
+
+
+class _DictCog:
+	def __init__(self, name, repo, raw_data):
+		self.name = name
+		self.author = raw_data.get("author", ["Unknown"])
+		self.description = raw_data.get("description", "")
+		self.short = raw_data.get("short", "")
+		self.hidden = False
+		self.disabled = False
+		self.repo = repo
+
+
+def _measure(model, body: bytes):
+	"""Build two snapshots with the given model and return their retained and peak memory."""
+	tracemalloc.start()
+	snapshots = [
+		[model(url, data) for url, data in json.loads(body).items()]
+		for _ in range(2)
+	]
+	retained, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	cog_count = sum(len(r.cogs) for r in snapshots[0])
+	return cog_count, retained, peak
+
+
+def main(argv):
+	cog_counts = [int(arg) for arg in argv] or [1000, 5000, 20000]
+	print(f'{"cogs":>8} {"model":>8} {"retained":>12} {"peak":>12}')
+	for cog_count in cog_counts:
+		# all repos are approved, the generator averages 8 cogs per repo
+		body = generate_index_bytes(max(cog_count // 8, 1), approved_ratio=1)
+		for label, model in (('dict', _DictRepo), ('slots', Repo)):
+			built_cogs, retained, peak = _measure(model, body)
+			print(f'{built_cogs:>8} {label:>8} {retained / 2**20:>10.2f}MB {peak / 2**20:>10.2f}MB')
+
+
+if __name__ == '__main__':
+	main(sys.argv[1:])
@@ -0,0 +1,152 @@
+"""
+Benchmark of the approvedupdater check pipeline.
+
+For every index size, a synthetic Red-Index is served from a local HTTP server
+and each hot path of a check is timed separately:
+
+- fetch: full download through `IndexFetcher` (200) and a conditional one (304)
+- build: JSON decoding and `Repo` construction
+- fingerprint: serialization and content hashes of the approved repos
+- check: `ApprovedUpdater._check_changes` against a snapshot with about 1% of repos changed
+- render: `ApprovedUpdater._build_string` without the cache
+
+Each stage is run once for timing and once under tracemalloc for its peak memory.
+
+Run from the repository root with: python -m benchmarks.bench_pipeline [REPO_COUNT ...]
+"""
+import asyncio
+import hashlib
+import inspect
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+from approvedupdater.approvedupdater import ApprovedUpdater
+from approvedupdater.fetcher import IndexFetcher
+
+from .synthetic_index import generate_index, mutate_index
+
+DEFAULT_SIZES = (100, 1000, 5000, 10000, 50000)
+
+
+class _Value:
+	def __init__(self, value):
+		self.value = value
+
+	async def __call__(self):
+		return self.value
+
+	async def all(self):
+		return self.value
+
+
+class _SnapshotConfig:
+	"""In-memory stand-in for the parts of Config read by `_check_changes`."""
+
+	def __init__(self, raw: dict, hashes: dict, index_hash: str):
+		self._raw = raw
+		self.lastHashes = _Value(hashes)
+		self.lastHash = _Value(index_hash)
+
+	def custom(self, group: str, url: str):
+		return _Value(self._raw.get(url, {}))
+
+
+async def _serve(body: bytes):
+	"""Serve `body` with ETag support on a random local port."""
+	etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+	async def handler(request):
+		if request.headers.get('If-None-Match') == etag:
+			return web.Response(status=304, headers={'ETag': etag})
+		return web.Response(body=body, headers={'ETag': etag}, content_type='application/json')
+
+	app = web.Application()
+	app.router.add_get('/index.json', handler)
+	runner = web.AppRunner(app)
+	await runner.setup()
+	site = web.TCPSite(runner, '127.0.0.1', 0)
+	await site.start()
+	host, port = runner.addresses[0][:2]
+	return runner, f'http://{host}:{port}/index.json'
+
+
+def _build(body: bytes):
+	"""Decode the index and build the approved Repos, like a check does."""
+	return ApprovedUpdater._build_repos(json.loads(body))
+
+
+async def _call(func, *args):
+	result = func(*args)
+	if inspect.isawaitable(result):
+		result = await result
+	return result
+
+
+async def _measure(func, *args):
+	"""Run `func` once for timing and once under tracemalloc. Returns (result, seconds, peak bytes)."""
+	start = time.perf_counter()
+	result = await _call(func, *args)
+	elapsed = time.perf_counter() - start
+	tracemalloc.start()
+	await _call(func, *args)
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return result, elapsed, peak
+
+
+async def bench_size(repo_count: int, session: aiohttp.ClientSession):
+	index = generate_index(repo_count)
+	body = json.dumps(index, separators=(',', ':')).encode('utf-8')
+	old_body = json.dumps(mutate_index(index), separators=(',', ':')).encode('utf-8')
+	runner, url = await _serve(body)
+	results = []
+	try:
+		with tempfile.TemporaryDirectory() as cache_dir:
+			fetcher = IndexFetcher(url, Path(cache_dir))
+			response, elapsed, peak = await _measure(fetcher.fetch, session)
+			results.append(('fetch (200)', elapsed, peak))
+			fetcher.commit(response)
+			_, elapsed, peak = await _measure(fetcher.fetch, session)
+			results.append(('fetch (304)', elapsed, peak))
+	finally:
+		await runner.cleanup()
+
+	repos, elapsed, peak = await _measure(_build, body)
+	results.append(('build', elapsed, peak))
+	(new_raw, new_hashes, index_hash), elapsed, peak = await _measure(ApprovedUpdater._snapshot_repos, repos)
+	results.append(('fingerprint', elapsed, peak))
+
+	updater = ApprovedUpdater.__new__(ApprovedUpdater)
+	updater._cogboard_cache = (None, '')
+	old_repos = _build(old_body)
+	updater.config = _SnapshotConfig(*ApprovedUpdater._snapshot_repos(old_repos))
+	_, elapsed, peak = await _measure(updater._check_changes, new_raw, new_hashes, index_hash)
+	results.append(('check', elapsed, peak))
+	_, elapsed, peak = await _measure(updater._build_string, repos)
+	results.append(('render', elapsed, peak))
+	return len(body), len(repos), results
+
+
+async def main(argv):
+	sizes = [int(arg) for arg in argv] or DEFAULT_SIZES
+	print(f'{"repos":>7} {"approved":>8} {"payload":>10} {"stage":<12} {"time":>10} {"repos/s":>12} {"peak":>10}')
+	async with aiohttp.ClientSession() as session:
+		for repo_count in sizes:
+			payload, approved, results = await bench_size(repo_count, session)
+			for stage, elapsed, peak in results:
+				throughput = repo_count / elapsed if elapsed else float('inf')
+				print(
+					f'{repo_count:>7} {approved:>8} {payload / 2**20:>8.2f}MB {stage:<12}'
+					f' {elapsed * 1000:>8.1f}ms {throughput:>12.0f} {peak / 2**20:>8.2f}MB'
+				)
+
+
+if __name__ == '__main__':
+	asyncio.run(main(sys.argv[1:]))
@@ -0,0 +1,86 @@
+"""Generator of synthetic Red-Index payloads for the benchmarks."""
+import json
+import random
+
+
+def generate_index(repo_count: int, *, cogs_per_repo: int = 8, approved_ratio: float = 0.5, seed: int = 0) -> dict:
+	"""
+	Generate a Red-Index-shaped dict with `repo_count` repos.
+
+	Repos alternate between the dict and the list shape of `rx_cogs`.
+	Dict-shaped repos also contain hidden and disabled cogs.
+	"""
+	rng = random.Random(seed)
+	index = {}
+	for i in range(repo_count):
+		owner = f'creator{i % max(repo_count // 3, 1)}'
+		author = [f'{owner} (Creator#{i % 10000:04})']
+		if rng.random() < 0.2:
+			author.append('co-maintainer')
+		cog_count = max(1, int(rng.gauss(cogs_per_repo, cogs_per_repo / 3)))
+		cogs = []
+		for j in range(cog_count):
+			cogs.append({
+				'name': f'cog{i}x{j}',
+				'author': author if rng.random() < 0.9 else [f'helper{j}'],
+				'description': f'Cog number {j} of repo {i}. ' * rng.randint(1, 6),
+				'short': f'Does thing {j}.',
+				'hidden': rng.random() < 0.05,
+				'disabled': rng.random() < 0.02,
+			})
+		if i % 2:
+			# the list shape doesn't carry hidden or disabled cogs
+			rx_cogs = [c for c in cogs if not (c['hidden'] or c['disabled'])]
+		else:
+			rx_cogs = {c.pop('name'): c for c in cogs}
+		index[f'https://github.com/{owner}/repo-{i}'] = {
+			'rx_category': 'approved' if rng.random() < approved_ratio else 'unapproved',
+			'rx_branch': 'main' if rng.random() < 0.3 else '',
+			'rx_cogs': rx_cogs,
+			'author': author,
+			'description': f'Repository number {i}. ' * rng.randint(1, 10),
+			'short': f'Repo {i} short description.',
+			'name': f'Repo-{i}',
+		}
+	return index
+
+
+def generate_index_bytes(repo_count: int, **kwargs) -> bytes:
+	"""Same as `generate_index()` but serialized like the minified index."""
+	return json.dumps(generate_index(repo_count, **kwargs), separators=(',', ':')).encode('utf-8')
+
+
+def mutate_index(index: dict, *, ratio: float = 0.01, seed: int = 1) -> dict:
+	"""
+	Get a copy of `index` where about `ratio` of the repos were added, removed or edited.
+
+	Useful as the "old" side of a diff against `index`.
+	"""
+	rng = random.Random(seed)
+	result = json.loads(json.dumps(index))
+	urls = list(result)
+	changed = max(1, int(len(urls) * ratio))
+	for url in rng.sample(urls, min(changed * 3, len(urls))):
+		action = rng.randrange(3)
+		if action == 0:
+			# missing in the old index, so it shows up as added
+			del result[url]
+		elif action == 1:
+			repo = result[url]
+			repo['rx_branch'] = 'old-branch'
+			cogs = repo['rx_cogs']
+			if isinstance(cogs, dict) and cogs:
+				cogs.pop(next(iter(cogs)))
+			elif cogs:
+				cogs[0]['short'] = 'Old short description.'
+		else:
+			result[url]['short'] = 'Old repo short description.'
+	for i in range(changed):
+		# only in the old index, so it shows up as removed
+		result[f'https://github.com/removed{i}/repo'] = {
+			'rx_category': 'approved',
+			'rx_cogs': {f'removedcog{i}': {'short': 'Gone.'}},
+			'author': [f'removed{i}'],
+			'name': f'Removed-{i}',
+		}
+	return result
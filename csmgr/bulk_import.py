@@ -0,0 +1,56 @@
+import csv
+import io
+import json
+from typing import Any, Dict, List
+
+COLUMNS = ("member", "url", "channel")
+MAX_ROWS = 200
+
+
+def parse_rows(filename: str, data: bytes) -> List[Dict[str, str]]:
+    """
+    Parses rows of a bulk import file.
+
+    JSON files (detected by the `.json` extension) should hold a list of objects
+    with `member`, `url`, and optionally `channel` keys, or a list of lists with values
+    in that order. Other files are parsed as CSV, which can start with a header row
+    naming the columns, otherwise the columns are expected in the above order.
+
+    Returns a list of dicts with all `COLUMNS` as keys, missing values are empty strings.
+
+    Raises `ValueError` if the file can't be parsed or a row is missing a required value.
+    """
+    text = data.decode("utf-8-sig")
+    if filename.lower().endswith(".json"):
+        raw_rows = json.loads(text)
+        if not isinstance(raw_rows, list):
+            raise ValueError("The JSON file should hold a list of rows.")
+        rows = [_parse_json_row(idx, raw_row) for idx, raw_row in enumerate(raw_rows, 1)]
+    else:
+        lines = [line for line in csv.reader(io.StringIO(text)) if any(map(str.strip, line))]
+        header = list(COLUMNS)
+        if lines and lines[0][0].strip().lower() in COLUMNS:
+            header = [cell.strip().lower() for cell in lines.pop(0)]
+        rows = [_normalize_row(dict(zip(header, line))) for line in lines]
+
+    if len(rows) > MAX_ROWS:
+        raise ValueError(f"The file has {len(rows)} rows, at most {MAX_ROWS} are allowed.")
+    for idx, row in enumerate(rows, 1):
+        if not row["member"] or not row["url"]:
+            raise ValueError(f"Row {idx} is missing the member or the URL.")
+    return rows
+
+
+def _parse_json_row(idx: int, raw_row: Any) -> Dict[str, str]:
+    if isinstance(raw_row, dict):
+        return _normalize_row(raw_row)
+    if isinstance(raw_row, list):
+        return _normalize_row(dict(zip(COLUMNS, raw_row)))
+    raise ValueError(f"Row {idx} should be an object or a list.")
+
+
+def _normalize_row(raw_row: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        column: "" if raw_row.get(column) is None else str(raw_row[column]).strip()
+        for column in COLUMNS
+    }
@@ -0,0 +1,84 @@
+import bisect
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+
+class ChannelIndex:
+    """
+    Index of a guild's text channels by name and by name order within each category.
+
+    The index is built from the guild's channel list on first use
+    and then kept up to date by the cog's channel create, update, and delete listeners.
+    """
+
+    def __init__(self, guild_id: int) -> None:
+        self.guild_id = guild_id
+        self._built = False
+        # {CHANNEL_NAME: {CHANNEL_ID: None}} (dict used as an ordered set)
+        self._by_name: Dict[str, Dict[int, None]] = {}
+        # {CATEGORY_ID: [(CHANNEL_NAME, CHANNEL_ID), ...]} sorted by name
+        self._by_category: Dict[Optional[int], List[Tuple[str, int]]] = {}
+        # {CHANNEL_ID: (CHANNEL_NAME, CATEGORY_ID)}
+        self._entries: Dict[int, Tuple[str, Optional[int]]] = {}
+
+    def ensure_built(self, guild: discord.Guild) -> None:
+        if self._built:
+            return
+        self._by_name.clear()
+        self._by_category.clear()
+        self._entries.clear()
+        for channel in guild.text_channels:
+            self.add(channel)
+        self._built = True
+
+    def invalidate(self) -> None:
+        """Forces the index to be rebuilt on next use."""
+        self._built = False
+
+    def add(self, channel: discord.abc.GuildChannel) -> None:
+        if not isinstance(channel, discord.TextChannel) or channel.guild.id != self.guild_id:
+            return
+        self.remove(channel.id)
+        self._by_name.setdefault(channel.name, {})[channel.id] = None
+        category_entries = self._by_category.setdefault(channel.category_id, [])
+        bisect.insort(category_entries, (channel.name, channel.id))
+        self._entries[channel.id] = (channel.name, channel.category_id)
+
+    def remove(self, channel_id: int) -> None:
+        try:
+            name, category_id = self._entries.pop(channel_id)
+        except KeyError:
+            return
+        same_name = self._by_name[name]
+        del same_name[channel_id]
+        if not same_name:
+            del self._by_name[name]
+        entries = self._by_category[category_id]
+        del entries[bisect.bisect_left(entries, (name, channel_id))]
+
+    def get_text_channel(self, guild: discord.Guild, name: str) -> Optional[discord.TextChannel]:
+        """Returns the first text channel with given name or `None` if there's no such channel."""
+        self.ensure_built(guild)
+        for channel_id in self._by_name.get(name, ()):
+            return guild.get_channel(channel_id)
+        return None
+
+    def get_position(
+        self, guild: discord.Guild, category: discord.CategoryChannel, name: str
+    ) -> Optional[int]:
+        """
+        Returns the position a channel with given name should be put on in given category,
+        assuming the category's channel list is alphabetical.
+
+        Returns `None` if the category doesn't have any text channels.
+        """
+        self.ensure_built(guild)
+        entries = self._by_category.get(category.id)
+        if not entries:
+            return None
+        # first channel with a name that sorts after the given name
+        idx = bisect.bisect_left(entries, (name, float("inf")))
+        if idx < len(entries):
+            return guild.get_channel(entries[idx][1]).position - 1
+        return guild.get_channel(entries[-1][1]).position
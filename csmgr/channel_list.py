@@ -0,0 +1,118 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+import discord
+
+from .profiling import timed
+
+
+class ChannelListSyncError(Exception):
+    """
+    Raised when syncing the channel list failed partway through.
+
+    `posted` holds the messages that are posted at the point of failure,
+    in the same format as the list returned by `sync_channel_list()`.
+    """
+
+    def __init__(self, posted: List[Dict[str, Any]]) -> None:
+        super().__init__("Syncing the channel list failed partway through.")
+        self.posted = posted
+
+
+def hash_embeds(embeds: Sequence[discord.Embed]) -> str:
+    """Returns a stable hash of the content of given embeds."""
+    data = json.dumps([embed.to_dict() for embed in embeds], sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class ChannelListTarget:
+    """Sends, edits, and deletes channel list messages either through a webhook or as the bot."""
+
+    def __init__(self, channel: discord.TextChannel, webhook: Optional[discord.Webhook]) -> None:
+        self.channel = channel
+        self.webhook = webhook
+
+    @property
+    def webhook_id(self) -> Optional[int]:
+        return None if self.webhook is None else self.webhook.id
+
+    @timed("rest")
+    async def send(self, embeds: List[discord.Embed]) -> int:
+        if self.webhook is not None:
+            message = await self.webhook.send(embeds=embeds, wait=True)
+        else:
+            message = await self.channel.send(embeds=embeds)
+        return message.id
+
+    @timed("rest")
+    async def edit(self, message_id: int, embeds: List[discord.Embed]) -> None:
+        if self.webhook is not None:
+            await self.webhook.edit_message(message_id, embeds=embeds)
+        else:
+            await self.channel.get_partial_message(message_id).edit(embeds=embeds)
+
+    @timed("rest")
+    async def delete(self, message_id: int) -> None:
+        """Deletes given message, ignoring messages that no longer exist."""
+        try:
+            if self.webhook is not None:
+                await self.webhook.delete_message(message_id)
+            else:
+                await self.channel.get_partial_message(message_id).delete()
+        except discord.NotFound:
+            pass
+
+
+async def sync_channel_list(
+    target: ChannelListTarget,
+    embed_groups: List[List[discord.Embed]],
+    posted: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Brings the channel list messages up to date with given embed groups.
+
+    `posted` is the list of previously posted messages as returned by this function,
+    i.e. dicts with `message_id` and `hash` of the embed group the message holds.
+    Only messages whose content changed are edited, and messages are only sent or deleted
+    when the number of embed groups changed.
+
+    Returns the new list of posted messages.
+
+    If a request fails, `ChannelListSyncError` is raised with the messages posted so far
+    and the original `discord.HTTPException` as its cause.
+    """
+    result: List[Dict[str, Any]] = []
+    try:
+        await _sync(target, embed_groups, posted, result)
+    except discord.HTTPException as e:
+        # messages that weren't reached yet are still posted with their old content
+        raise ChannelListSyncError(result + posted[len(result) :]) from e
+    return result
+
+
+async def _sync(
+    target: ChannelListTarget,
+    embed_groups: List[List[discord.Embed]],
+    posted: List[Dict[str, Any]],
+    result: List[Dict[str, Any]],
+) -> None:
+    for idx, embeds in enumerate(embed_groups):
+        digest = hash_embeds(embeds)
+        if idx < len(posted):
+            message_id = posted[idx]["message_id"]
+            if posted[idx]["hash"] != digest:
+                try:
+                    await target.edit(message_id, embeds)
+                except discord.NotFound:
+                    # someone deleted the message, the rest has to be reposted to keep the order
+                    for entry in posted[idx:]:
+                        await target.delete(entry["message_id"])
+                    posted = posted[:idx]
+                    message_id = await target.send(embeds)
+        else:
+            message_id = await target.send(embeds)
+        result.append({"message_id": message_id, "hash": digest})
+
+    for entry in posted[len(embed_groups) :]:
+        await target.delete(entry["message_id"])
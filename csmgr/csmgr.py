@@ -1,15 +1,18 @@
 import asyncio
 import logging
-import math
-from typing import Any, Dict, List, Union
+import time
+from typing import Any, Dict, List, Tuple, Union
 
 import aiohttp
 import discord
 from redbot.core import commands, Config
 from redbot.core.bot import Red
 from redbot.core.commands import NoParseOptional as Optional
-from redbot.core.utils.menus import menu
+from redbot.core.utils.chat_formatting import box, pagify, text_to_file
 
+from .bulk_import import parse_rows
+from .channel_index import ChannelIndex
+from .channel_list import ChannelListSyncError, ChannelListTarget, sync_channel_list
 from .checks import is_org_member, is_senior_cog_creator
 from .discord_ids import (
     COG_CREATOR_ROLE_ID,
@@ -19,9 +22,20 @@ from .discord_ids import (
     V3_COG_SUPPORT_CATEGORY_ID,
     CHANNEL_ARCHIVE_ID,
 )
-from .discord_utils import add_textchannel, get_webhook, safe_add_role, safe_remove_role
-from .repo import CONFIG_COG_NAME, CONFIG_IDENTIFIER, CreatorLevel, Repo
-from .utils import grouper, parse_repo_url
+from .discord_utils import (
+    add_textchannel,
+    get_webhook,
+    invalidate_icon_cache,
+    invalidate_webhook_cache,
+    safe_add_role,
+    safe_remove_role,
+)
+from .repo import CONFIG_COG_NAME, CONFIG_IDENTIFIER, CreatorLevel, Repo, RepoRegistry
+from .url_checks import RepoUrlChecker, UrlStatus
+from .liveness import LivenessScanner
+from .profiling import Profiler, timed, track
+from .utils import canonical_repo_url, pack_embeds, parse_repo_url
+from .views import FieldPageSource, LazyPageMenu
 
 log = logging.getLogger("red.cogsupport-cogs.csmgr")
 
@@ -35,11 +49,29 @@ class CSMgr(commands.Cog):
         super().__init__()
         self.bot = bot
         self.config = Config.get_conf(None, identifier=CONFIG_IDENTIFIER, cog_name=CONFIG_COG_NAME)
-        self.config.register_global(schema_version=0)
+        self.config.register_global(
+            schema_version=0,
+            validation_concurrency=5,
+            liveness_interval=6 * 3600,
+            liveness_concurrency=20,
+            liveness_host_rate=50.0,
+            profiling_enabled=False,
+        )
+        # channel list messages posted in the channel: [{"message_id": int, "hash": str}]
+        self.config.register_channel(channel_list_messages=[], channel_list_webhook_id=None)
         # {USER_ID: {LOWERED_REPO_NAME: {}}}
         self.config.init_custom("REPO", 2)
         self.config.register_custom("REPO")
-        self.session = aiohttp.ClientSession()
+        self.registry = RepoRegistry(bot)
+        self.channel_index = ChannelIndex(COG_SUPPORT_SERVER_ID)
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=30),
+        )
+        self.url_checker = RepoUrlChecker(self.session)
+        self.liveness_scanner = LivenessScanner(self.url_checker)
+        self._liveness_task: Optional[asyncio.Task] = None
+        self.profiler = Profiler()
 
     async def cog_check(self, ctx: commands.Context) -> bool:
         # commands in this cog should only run in Cog Support server
@@ -47,10 +79,61 @@ class CSMgr(commands.Cog):
 
     async def cog_load(self) -> None:
         await self._config_migration()
+        await self.registry.load()
+        self.profiler.enabled = await self.config.profiling_enabled()
+        self._liveness_task = asyncio.create_task(self._liveness_loop())
 
     async def cog_unload(self) -> None:
+        if self._liveness_task is not None:
+            self._liveness_task.cancel()
         if not self.session.closed:
             await self.session.close()
+        invalidate_webhook_cache()
+        invalidate_icon_cache()
+
+    async def cog_before_invoke(self, ctx: commands.Context) -> None:
+        self.profiler.start(id(ctx), ctx.command.qualified_name)
+        if self.profiler.enabled:
+            # every command responds through `ctx.send()`, so it's tracked for the whole invocation
+            ctx.send = timed("rest")(ctx.send)
+
+    async def cog_after_invoke(self, ctx: commands.Context) -> None:
+        report = self.profiler.stop(id(ctx))
+        if report is not None:
+            await ctx.send(
+                f"cProfile capture of `{ctx.command.qualified_name}`:",
+                file=text_to_file(report, "profile.txt"),
+            )
+
+    @commands.Cog.listener()
+    async def on_webhooks_update(self, channel: discord.abc.GuildChannel) -> None:
+        invalidate_webhook_cache(channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel) -> None:
+        self.channel_index.add(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(
+        self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+    ) -> None:
+        self.channel_index.add(after)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        invalidate_webhook_cache(channel.id)
+        self.channel_index.remove(channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild) -> None:
+        # channel events could have been missed while the guild was unavailable
+        if guild.id == self.channel_index.guild_id:
+            self.channel_index.invalidate()
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before: discord.Guild, after: discord.Guild) -> None:
+        if before.icon is not None and before.icon != after.icon:
+            invalidate_icon_cache(before.icon.key)
 
     async def _config_migration(self) -> None:
         schema_version = await self.config.schema_version()
@@ -115,13 +198,22 @@ class CSMgr(commands.Cog):
         return [repo for repos in all_users.values() for repo in repos]
 
     async def get_all_repos(self) -> Dict[int, List[Repo]]:
-        return await Repo.from_config(self.bot)
+        return self.registry.get_all_repos()
 
     async def get_user_repos(self, user_id: int) -> List[Repo]:
-        return await Repo.from_config(self.bot, user_id)
+        return self.registry.get_user_repos(user_id)
 
     async def get_repo(self, user_id: int, repo_name: str) -> Repo:
-        return await Repo.from_config(self.bot, user_id, repo_name)
+        return self.registry.get_repo(user_id, repo_name)
+
+    def get_repo_by_url(self, url: str) -> Optional[Repo]:
+        return self.registry.get_repo_by_url(url)
+
+    def get_repo_by_support_channel(self, channel_id: int) -> Optional[Repo]:
+        return self.registry.get_repo_by_support_channel(channel_id)
+
+    def find_repos_by_name(self, repo_name: str) -> List[Repo]:
+        return self.registry.find_repos_by_name(repo_name)
 
     @property
     def cog_support_guild(self):
@@ -154,26 +246,25 @@ class CSMgr(commands.Cog):
         Show a list of all Cog Creators and their repos.
         """
         all_repos = await self.get_all_repos_flattened()
-        total_pages = math.ceil(len(all_repos) / 9)
-        pages = []
-        for idx, repo_group in enumerate(grouper(all_repos, 9), 1):
-            embed = discord.Embed(title="Repo list")
-            for repo in repo_group:
-                support_channel = (
-                    None if repo.support_channel is None else repo.support_channel.mention
-                )
-                embed.add_field(
-                    name=repo.name,
-                    value=(
-                        f"**Creator:**\n{repo.username}\n"
-                        f"**Creator level:**\n{repo.creator_level!s}\n"
-                        f"**Support channel:**\n{support_channel}\n"
-                        f"[Repo link]({repo.url})"
-                    ),
-                )
-            embed.set_footer(text=f"Page {idx}/{total_pages}")
-            pages.append(embed)
-        await menu(ctx, pages)
+        if not all_repos:
+            await ctx.send("There are no registered repos.")
+            return
+        fields = (self._make_reposlist_field(repo) for repo in all_repos)
+        source = FieldPageSource(fields, title="Repo list")
+        await LazyPageMenu(source, author_id=ctx.author.id).start(ctx)
+
+    @staticmethod
+    def _make_reposlist_field(repo: Repo) -> Tuple[str, str]:
+        support_channel = None if repo.support_channel is None else repo.support_channel.mention
+        return (
+            repo.name,
+            (
+                f"**Creator:**\n{repo.username}\n"
+                f"**Creator level:**\n{repo.creator_level!s}\n"
+                f"**Support channel:**\n{support_channel}\n"
+                f"[Repo link]({repo.url})"
+            ),
+        )
 
     @is_org_member()
     @commands.command()
@@ -192,15 +283,24 @@ class CSMgr(commands.Cog):
         """
         # XXX: hmm, this limitation doesn't make *that* much sense,
         # XXX: but some data would need to be moved elsewhere if I were to remove this
-        if await self.config.custom("REPO", str(member.id)).all():
+        if self.registry.get_user_repos(member.id):
             await ctx.send("That user has already been marked as a cog creator")
             return
+        if (existing_repo := self.registry.get_repo_by_url(url)) is not None:
+            await ctx.send(f"That repo is already registered for {existing_repo.username}.")
+            return
+        if channel is not None and not await self._check_channel_available(ctx, channel):
+            return
 
-        service, repo_owner, repo_name = parse_repo_url(url)
-        async with self.session.get(url, allow_redirects=False) as resp:
-            if service.lower() == "gitlab" and resp.status == 302 or resp.status == 404:
-                await ctx.send("Repo with the given URL doesn't exist.")
-                return
+        _, _, repo_name = parse_repo_url(url)
+        try:
+            url_status = await self.url_checker.check(url)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            await ctx.send("I couldn't check whether the repo exists, try again later.")
+            return
+        if url_status is UrlStatus.MISSING:
+            await ctx.send("Repo with the given URL doesn't exist.")
+            return
 
         repo = Repo(
             bot=self.bot,
@@ -215,6 +315,304 @@ class CSMgr(commands.Cog):
         await safe_add_role(ctx, member, self.cog_creator_role)
         await ctx.send(f"Done. {member.mention} is now a cog creator!")
     
+    @is_org_member()
+    @commands.command()
+    async def addcreators(self, ctx: commands.GuildContext) -> None:
+        """
+        Register multiple cog creators from an attached CSV or JSON file
+
+        Each row needs a member and a link to the repository and can have a support channel.
+        CSV files can start with a `member,url,channel` header, otherwise the columns
+        are expected in that order.
+        JSON files should hold a list of objects with `member`, `url`, and `channel` keys.
+
+        Repo URLs are validated concurrently and all creators are saved at once.
+        """
+        if not ctx.message.attachments:
+            await ctx.send("Please attach a CSV or JSON file with the creators to add.")
+            return
+        attachment = ctx.message.attachments[0]
+        try:
+            async with track("rest"):
+                data = await attachment.read()
+            rows = parse_rows(attachment.filename, data)
+        except ValueError as e:
+            await ctx.send(f"I couldn't parse the attached file: {e}")
+            return
+
+        async with ctx.typing():
+            results = await self._add_creators(ctx, rows)
+
+        report = "\n".join(
+            f"{idx}. {row['member']} ({row['url']}): {result}"
+            for idx, (row, result) in enumerate(zip(rows, results), 1)
+        )
+        if len(report) > 1900:
+            await ctx.send("Done.", file=text_to_file(report, "addcreators.txt"))
+        else:
+            await ctx.send(box(report))
+
+    async def _add_creators(
+        self, ctx: commands.GuildContext, rows: List[Dict[str, str]]
+    ) -> List[str]:
+        """
+        Registers cog creators from given bulk import rows.
+
+        Returns the result of each row.
+        """
+        results = [""] * len(rows)
+        candidates: List[Tuple[int, discord.Member, Repo, Optional[discord.TextChannel]]] = []
+        seen_members = set()
+        seen_urls = set()
+        seen_channels = set()
+        for idx, row in enumerate(rows):
+            try:
+                async with track("rest"):
+                    member = await commands.MemberConverter().convert(ctx, row["member"])
+                    channel = None
+                    if row["channel"]:
+                        channel = await commands.TextChannelConverter().convert(
+                            ctx, row["channel"]
+                        )
+            except commands.BadArgument as e:
+                results[idx] = f"failed, {e}"
+                continue
+            url = row["url"]
+            try:
+                _, _, repo_name = parse_repo_url(url)
+            except (AssertionError, ValueError):
+                results[idx] = "failed, invalid repo URL"
+                continue
+            url_key = canonical_repo_url(url)
+            if member.id in seen_members or self.registry.get_user_repos(member.id):
+                results[idx] = "failed, member is already a cog creator"
+            elif url_key in seen_urls or self.registry.get_repo_by_url(url) is not None:
+                results[idx] = "failed, repo is already registered"
+            elif channel is not None and (
+                channel.id in seen_channels
+                or self.registry.get_repo_by_support_channel(channel.id) is not None
+            ):
+                results[idx] = "failed, channel is already a support channel"
+            else:
+                seen_members.add(member.id)
+                seen_urls.add(url_key)
+                if channel is not None:
+                    seen_channels.add(channel.id)
+                repo = Repo(bot=self.bot, repo_name=repo_name, repo_url=url, user_id=member.id)
+                candidates.append((idx, member, repo, channel))
+
+        statuses = await self._check_repo_urls([repo.url for _, _, repo, _ in candidates])
+
+        to_save: List[Tuple[int, discord.Member, Repo]] = []
+        for (idx, member, repo, channel), status in zip(candidates, statuses):
+            if isinstance(status, BaseException):
+                results[idx] = "failed, couldn't check the repo URL"
+                continue
+            if status is UrlStatus.MISSING:
+                results[idx] = "failed, repo doesn't exist"
+                continue
+            if channel is None:
+                channel = self.channel_index.get_text_channel(
+                    ctx.guild, f"support_{repo.name.lower()}"
+                )
+                if channel is not None and (
+                    channel.id in seen_channels
+                    or self.registry.get_repo_by_support_channel(channel.id) is not None
+                ):
+                    channel = None
+                if channel is not None:
+                    seen_channels.add(channel.id)
+            result = "added"
+            if channel is not None:
+                repo.support_channel = channel
+                result += f" with support channel #{channel.name}"
+                if await self._fix_support_channel(ctx, channel) is False:
+                    result += " (couldn't move it to V3 support category)"
+            results[idx] = result
+            to_save.append((idx, member, repo))
+
+        await self.registry.save_all([repo for _, _, repo in to_save])
+        for idx, member, _ in to_save:
+            await safe_add_role(ctx, member, self.cog_creator_role)
+        return results
+
+    async def _check_repo_urls(self, urls: List[str]) -> List[Union[UrlStatus, BaseException]]:
+        """
+        Checks given repo URLs concurrently,
+        running at most `validation_concurrency` checks at once.
+
+        Exceptions raised by the checks are returned in place of the status.
+        """
+        async with track("config"):
+            concurrency = await self.config.validation_concurrency()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def check(url: str) -> UrlStatus:
+            async with semaphore:
+                return await self.url_checker.check(url)
+
+        results = await asyncio.gather(*map(check, urls), return_exceptions=True)
+        for url, result in zip(urls, results):
+            if isinstance(result, BaseException):
+                log.warning("Couldn't check repo URL %s", url, exc_info=result)
+        return results
+
+    @is_org_member()
+    @commands.command()
+    async def validationconcurrency(self, ctx: commands.Context, limit: int) -> None:
+        """
+        Set how many repo URLs can be validated at once by bulk commands
+        """
+        if not 1 <= limit <= 50:
+            await ctx.send("The limit has to be between 1 and 50.")
+            return
+        async with track("config"):
+            await self.config.validation_concurrency.set(limit)
+        await ctx.send(f"Up to {limit} repo URLs will now be validated at once.")
+
+    async def _liveness_loop(self) -> None:
+        await self.bot.wait_until_red_ready()
+        while True:
+            try:
+                await self._scan_liveness()
+            except Exception:
+                log.exception("Repo liveness scan failed.")
+            await asyncio.sleep(await self.config.liveness_interval())
+
+    async def _scan_liveness(self) -> None:
+        scanner = self.liveness_scanner
+        scanner.concurrency = await self.config.liveness_concurrency()
+        scanner.per_host_rate = await self.config.liveness_host_rate()
+        repos = await self.get_all_repos_flattened()
+        start = time.perf_counter()
+        await scanner.scan(repo.url for repo in repos)
+        log.debug(
+            "Checked %s repo URLs in %.2f seconds.", len(repos), time.perf_counter() - start
+        )
+
+    @is_org_member()
+    @commands.command()
+    async def deadrepos(self, ctx: commands.GuildContext) -> None:
+        """
+        Show registered repos that no longer exist or were moved
+
+        The list comes from the last periodic scan of all repo URLs.
+        """
+        scanner = self.liveness_scanner
+        if scanner.last_scan_finished is None:
+            await ctx.send("Repo URLs haven't been scanned yet, try again later.")
+            return
+
+        lines = []
+        for repo in await self.get_all_repos_flattened():
+            result = scanner.results.get(repo.url)
+            if result is None or result.status is UrlStatus.EXISTS:
+                continue
+            if result.status is UrlStatus.MISSING:
+                state = "missing"
+            elif result.status is UrlStatus.REDIRECTED:
+                state = f"redirected to <{result.location}>"
+            else:
+                state = "unreachable"
+            lines.append(
+                f"<@{repo.user_id}> - <{repo.url}> - {state}"
+                f" (checked <t:{int(result.checked_at)}:R>)"
+            )
+
+        header = f"Last scan finished <t:{int(scanner.last_scan_finished)}:R>."
+        if not lines:
+            await ctx.send(f"{header} All registered repos exist.")
+            return
+        for page in pagify("\n".join([header, *lines])):
+            await ctx.send(page, allowed_mentions=discord.AllowedMentions.none())
+
+    @is_org_member()
+    @commands.command()
+    async def livenessinterval(self, ctx: commands.Context, hours: float) -> None:
+        """
+        Set how often all registered repo URLs are scanned, in hours
+        """
+        if hours < 1:
+            await ctx.send("The interval has to be at least 1 hour.")
+            return
+        async with track("config"):
+            await self.config.liveness_interval.set(int(hours * 3600))
+        await ctx.send(
+            f"Repo URLs will now be scanned every {hours:g} hours, starting after the next scan."
+        )
+
+    @commands.is_owner()
+    @commands.group()
+    async def csmgrprofile(self, ctx: commands.Context) -> None:
+        """
+        Inspect where CSMgr commands spend their time
+
+        Profiling is opt-in, enable it with `[p]csmgrprofile enable`.
+        """
+
+    @csmgrprofile.command(name="enable")
+    async def csmgrprofile_enable(self, ctx: commands.Context) -> None:
+        """Start recording time spent by CSMgr commands"""
+        async with track("config"):
+            await self.config.profiling_enabled.set(True)
+        self.profiler.enabled = True
+        await ctx.send("Profiling of CSMgr commands is now enabled.")
+
+    @csmgrprofile.command(name="disable")
+    async def csmgrprofile_disable(self, ctx: commands.Context) -> None:
+        """Stop recording time spent by CSMgr commands"""
+        async with track("config"):
+            await self.config.profiling_enabled.set(False)
+        self.profiler.enabled = False
+        await ctx.send("Profiling of CSMgr commands is now disabled.")
+
+    @csmgrprofile.command(name="reset")
+    async def csmgrprofile_reset(self, ctx: commands.Context) -> None:
+        """Forget all recorded timings"""
+        self.profiler.reset()
+        await ctx.send("Recorded timings were cleared.")
+
+    @csmgrprofile.command(name="dump")
+    async def csmgrprofile_dump(self, ctx: commands.Context) -> None:
+        """
+        Show recorded timings of CSMgr commands
+
+        Times are in milliseconds, percentiles are approximated by histogram buckets.
+        """
+        summary = self.profiler.summary()
+        if not summary:
+            await ctx.send("No timings were recorded yet.")
+            return
+        lines = [
+            f"{'Command':<22}{'Runs':>5}{'p50':>7}{'p95':>7}"
+            f"{'Config':>8}{'REST':>8}{'Python':>8}  (mean)"
+        ]
+        for name, runs, histograms in summary:
+            total = histograms["total"]
+            lines.append(
+                f"{name:<22}{runs:>5}{total.percentile(50):>7g}{total.percentile(95):>7g}"
+                f"{histograms['config'].mean:>8.1f}{histograms['rest'].mean:>8.1f}"
+                f"{histograms['python'].mean:>8.1f}"
+            )
+        for page in pagify("\n".join(lines), page_length=1900):
+            await ctx.send(box(page))
+
+    @csmgrprofile.command(name="capture")
+    async def csmgrprofile_capture(self, ctx: commands.Context, *, command_name: str) -> None:
+        """
+        Capture the next invocation of given CSMgr command with cProfile
+
+        cProfile also records everything else that runs on the event loop in the meantime.
+        """
+        command = self.bot.get_command(command_name)
+        if command is None or command.cog is not self:
+            await ctx.send("That's not a CSMgr command.")
+            return
+        self.profiler.capture_command = command.qualified_name
+        await ctx.send(
+            f"The next invocation of `{command.qualified_name}` will be captured with cProfile."
+        )
+
     @is_org_member()
     @commands.command()
     async def removecreator(self, ctx: commands.Context, user: Union[discord.Member, int]) -> None:
@@ -241,7 +639,7 @@ class CSMgr(commands.Cog):
             support_channel = repo.support_channel
             if not support_channel:
                 continue
-        await self.config.custom("REPO").clear_raw(user_id)  # Remove their data
+        await self.registry.clear_user(user_id)  # Remove their data
         await ctx.send("Creator removal successful.")
 
     @is_org_member()
@@ -259,6 +657,8 @@ class CSMgr(commands.Cog):
         if repo.support_channel is not None:
             await ctx.send("It appears a channel already exists for that repo!")
             return
+        if channel is not None and not await self._check_channel_available(ctx, channel):
+            return
 
         await self._grant_support_channel(ctx, member, repo, channel)
 
@@ -318,10 +718,50 @@ class CSMgr(commands.Cog):
     async def makechannellist(self, ctx: commands.GuildContext) -> None:
         """
         Make a list of all support channels
+
+        When the list was already posted in this channel, only the messages that changed are edited.
         """
-        all_users = await self.get_all_repos()
+        embeds = self._make_channel_list_embeds()
+
+        webhook = await get_webhook(ctx.channel)
+        target = ChannelListTarget(ctx.channel, webhook)
+        channel_config = self.config.channel(ctx.channel)
+        async with track("config"):
+            posted = await channel_config.channel_list_messages()
+            webhook_id = await channel_config.channel_list_webhook_id()
+        if webhook_id != target.webhook_id:
+            # messages sent by a different author can't be edited, start over
+            old_target = ChannelListTarget(ctx.channel, None)
+            for entry in posted:
+                try:
+                    await old_target.delete(entry["message_id"])
+                except discord.HTTPException:
+                    pass
+            posted = []
+
+        sync_error = None
+        try:
+            posted = await sync_channel_list(target, list(pack_embeds(embeds)), posted)
+        except ChannelListSyncError as e:
+            # save what was sent before the failure, so the next run doesn't duplicate it
+            posted, sync_error = e.posted, e
+        async with track("config"):
+            await channel_config.channel_list_messages.set(posted)
+            await channel_config.channel_list_webhook_id.set(target.webhook_id)
+        if sync_error is not None:
+            raise sync_error
+
+        if not ctx.channel.permissions_for(ctx.me).manage_messages:
+            return
+        try:
+            async with track("rest"):
+                await ctx.message.delete()
+        except discord.Forbidden:
+            pass
+
+    def _make_channel_list_embeds(self) -> List[discord.Embed]:
         embeds: List[discord.Embed] = []
-        for repos in all_users.values():
+        for repos in self.registry.get_all_repos().values():
             for repo in repos:
                 embed = discord.Embed(title=repo.name)
                 embed.url = repo.url
@@ -335,19 +775,7 @@ class CSMgr(commands.Cog):
                     support_channel = self.default_support_channel.mention
                 embed.add_field(name="Support channel", value=support_channel, inline=False)
                 embeds.append(embed)
-
-        messageable = await get_webhook(ctx.channel)
-        if messageable is None:
-            messageable = ctx
-        for embed_group in grouper(embeds, 10):
-            await messageable.send(embeds=embed_group)
-
-        if not ctx.channel.permissions_for(ctx.me).manage_messages:
-            return
-        try:
-            await ctx.message.delete()
-        except discord.Forbidden:
-            pass
+        return embeds
 
     async def _grant_support_channel(
         self,
@@ -370,7 +798,13 @@ class CSMgr(commands.Cog):
 
         channel_name = f"support_{repo.name.lower()}"
 
-        channel = await add_textchannel(ctx, channel_name, member, self.support_category_channel)
+        channel = await add_textchannel(
+            ctx,
+            channel_name,
+            member,
+            self.support_category_channel,
+            channel_index=self.channel_index,
+        )
         if channel is None:
             return
 
@@ -378,6 +812,23 @@ class CSMgr(commands.Cog):
         await repo.save()
         await ctx.send(f"{channel.mention} has been created!")
 
+    async def _check_channel_available(
+        self, ctx: commands.GuildContext, channel: discord.TextChannel
+    ) -> bool:
+        """
+        Checks that given channel isn't a support channel of any repo yet.
+
+        This method provides feedback using `ctx.send()`.
+        """
+        owner_repo = self.registry.get_repo_by_support_channel(channel.id)
+        if owner_repo is None:
+            return True
+        await ctx.send(
+            f"{channel.mention} is already the support channel"
+            f" for {owner_repo.name} from {owner_repo.username}."
+        )
+        return False
+
     async def _find_support_channel(
         self, ctx: commands.GuildContext, repo: Repo, channel: Optional[discord.TextChannel]
     ) -> Optional[discord.TextChannel]:
@@ -390,10 +841,15 @@ class CSMgr(commands.Cog):
         """
         if channel is None:
             channel_name = f"support_{repo.name.lower()}"
-            for channel in ctx.guild.text_channels:
-                if channel.name == channel_name:
-                    break
-            else:
+            channel = self.channel_index.get_text_channel(ctx.guild, channel_name)
+            if channel is None:
+                return None
+            # a repo with the same name from another creator may already own the channel
+            owner_repo = self.registry.get_repo_by_support_channel(channel.id)
+            if (
+                owner_repo is not None
+                and owner_repo.config_identifiers != repo.config_identifiers
+            ):
                 return None
 
         if (result := await self._fix_support_channel(ctx, channel)) is True:
@@ -431,10 +887,11 @@ class CSMgr(commands.Cog):
             return False
 
         try:
-            await channel.edit(
-                category=self.support_category_channel,
-                reason="Moving channel to V3 support category",
-            )
+            async with track("rest"):
+                await channel.edit(
+                    category=self.support_category_channel,
+                    reason="Moving channel to V3 support category",
+                )
         except discord.Forbidden:
             return False
         return True
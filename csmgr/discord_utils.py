@@ -1,18 +1,34 @@
-from typing import Optional
+from typing import Dict, Optional
 
 import discord
 from redbot.core import commands
 
+from .channel_index import ChannelIndex
+from .profiling import timed
 
+WEBHOOK_NAME = "Cog Support channel guide"
+
+# {CHANNEL_ID: Webhook}
+_webhook_cache: Dict[int, discord.Webhook] = {}
+# {ICON_HASH: ICON_BYTES}
+_icon_cache: Dict[str, bytes] = {}
+
+
+@timed("rest")
 async def add_textchannel(
     ctx: commands.GuildContext,
     name: str,
     owner: discord.Member,
     category: discord.CategoryChannel,
+    *,
+    channel_index: Optional[ChannelIndex] = None,
 ) -> Optional[discord.TextChannel]:
     """
     Adds a text channel with given `owner` having all manage perms in it.
 
+    If `channel_index` is passed, it's used to find the channel's position
+    instead of scanning the category's channels.
+
     This function doesn't raise and instead returns `None` if channel couldn't be created.
 
     This function provides feedback using `ctx.send()`.
@@ -28,7 +44,9 @@ async def add_textchannel(
     }
 
     # try to put the channel on proper position by assuming the channel list is alphabetical
-    if category.channels:
+    if channel_index is not None:
+        position = channel_index.get_position(ctx.guild, category, name)
+    elif category.channels:
         for channel in category.channels:
             if channel.name > name:
                 position = channel.position - 1
@@ -53,30 +71,67 @@ async def add_textchannel(
         return None
 
 
+@timed("rest")
 async def get_webhook(channel: discord.TextChannel) -> Optional[discord.Webhook]:
     """
     Gets existing or creates new webhook for given channel
     or returns `None` if bot doesn't have proper permissions.
+
+    Found webhooks are cached per channel until `invalidate_webhook_cache()` is called for it.
     """
     guild = channel.guild
     if not channel.permissions_for(guild.me).manage_webhooks:
         return None
+    if (webhook := _webhook_cache.get(channel.id)) is not None:
+        return webhook
     try:
         webhooks = await channel.webhooks()
     except discord.Forbidden:
         return None
     for webhook in webhooks:
-        if webhook.name == "Cog Support channel guide":
+        if webhook.name == WEBHOOK_NAME:
             break
     else:
         webhook = await channel.create_webhook(
-            name="Cog Support channel guide",
-            avatar=await guild.icon_url.read(),
+            name=WEBHOOK_NAME,
+            avatar=await get_guild_icon(guild),
             reason="Generating channel list",
         )
+    _webhook_cache[channel.id] = webhook
     return webhook
 
 
+@timed("rest")
+async def get_guild_icon(guild: discord.Guild) -> Optional[bytes]:
+    """
+    Gets the bytes of the guild's icon or `None` if the guild doesn't have one.
+
+    Icons are cached by their hash, so the same icon is only downloaded once.
+    """
+    if guild.icon is None:
+        return None
+    if (data := _icon_cache.get(guild.icon.key)) is None:
+        data = _icon_cache[guild.icon.key] = await guild.icon.read()
+    return data
+
+
+def invalidate_webhook_cache(channel_id: Optional[int] = None) -> None:
+    """Forgets the cached webhook of given channel or of all channels if `channel_id` is `None`."""
+    if channel_id is None:
+        _webhook_cache.clear()
+    else:
+        _webhook_cache.pop(channel_id, None)
+
+
+def invalidate_icon_cache(icon_hash: Optional[str] = None) -> None:
+    """Forgets the cached icon with given hash or all cached icons if `icon_hash` is `None`."""
+    if icon_hash is None:
+        _icon_cache.clear()
+    else:
+        _icon_cache.pop(icon_hash, None)
+
+
+@timed("rest")
 async def safe_add_role(
     ctx: commands.GuildContext, member: discord.Member, role: discord.Role
 ) -> None:
@@ -93,6 +148,7 @@ async def safe_add_role(
         await ctx.send(f"I wasn't able to add {role.name} role.")
 
 
+@timed("rest")
 async def safe_remove_role(
     ctx: commands.Context, member: discord.Member, role: discord.Role
 ) -> None:
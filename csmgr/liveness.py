@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, NamedTuple, Optional
+
+import aiohttp
+import yarl
+
+from .url_checks import RepoUrlChecker, UrlStatus
+
+log = logging.getLogger("red.cogsupport-cogs.csmgr.liveness")
+
+
+class LivenessResult(NamedTuple):
+    # `None` if the host couldn't be reached
+    status: Optional[UrlStatus]
+    location: Optional[str]
+    checked_at: float
+
+
+class HostRateLimiter:
+    """Spaces out the starts of requests to the same host to at most `rate` per second."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate
+        # {HOST: LOOP_TIME_OF_NEXT_FREE_SLOT}
+        self._next_slot: Dict[str, float] = {}
+
+    async def wait(self, host: str) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class LivenessScanner:
+    """
+    Checks whether repo URLs still exist and caches the results with their timestamps.
+
+    Scans run at most `concurrency` checks at once, and requests to a single host
+    are limited to `per_host_rate` per second.
+    """
+
+    def __init__(
+        self, checker: RepoUrlChecker, *, concurrency: int = 20, per_host_rate: float = 50.0
+    ) -> None:
+        self.checker = checker
+        self.concurrency = concurrency
+        self.per_host_rate = per_host_rate
+        # {REPO_URL: LivenessResult}
+        self.results: Dict[str, LivenessResult] = {}
+        self.last_scan_started: Optional[float] = None
+        self.last_scan_finished: Optional[float] = None
+
+    async def scan(self, urls: Iterable[str]) -> None:
+        urls = set(urls)
+        self.last_scan_started = time.time()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        rate_limiter = HostRateLimiter(self.per_host_rate)
+
+        async def check(url: str) -> None:
+            async with semaphore:
+                await rate_limiter.wait(yarl.URL(url).host or "")
+                try:
+                    # scans always ask the host, refreshing the checker's cache on the way
+                    status, location = await self.checker.check_with_location(
+                        url, use_cache=False
+                    )
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    log.debug("Couldn't reach %s", url, exc_info=e)
+                    status, location = None, None
+                except Exception:
+                    # one bad URL mustn't abort the scan of all the others
+                    log.exception("Unexpected error while checking %s", url)
+                    status, location = None, None
+                self.results[url] = LivenessResult(status, location, time.time())
+
+        await asyncio.gather(*map(check, urls))
+        # forget repos that are no longer registered
+        for url in self.results.keys() - urls:
+            del self.results[url]
+        self.last_scan_finished = time.time()
@@ -0,0 +1,172 @@
+import bisect
+import contextvars
+import cProfile
+import functools
+import io
+import pstats
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+_T = TypeVar("_T")
+
+CATEGORIES = ("config", "rest", "python")
+# upper bounds of histogram buckets, in milliseconds, the last bucket is unbounded
+BUCKET_BOUNDS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Fixed-size histogram of durations with logarithmic-ish buckets."""
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """Returns upper bound (in milliseconds) of the bucket holding given percentile."""
+        rank = pct / 100 * self.count
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return BUCKET_BOUNDS[idx] if idx < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+
+class CommandProfile:
+    """Time spent by a single command invocation in each category."""
+
+    def __init__(self, command_name: str) -> None:
+        self.command_name = command_name
+        self.start = time.perf_counter()
+        # {CATEGORY: SECONDS}
+        self.spent: Dict[str, float] = {"config": 0.0, "rest": 0.0}
+        # nesting depth of timed sections, only the outermost one is counted
+        self._depth = 0
+
+
+_current_profile: contextvars.ContextVar[Optional[CommandProfile]] = contextvars.ContextVar(
+    "csmgr_current_profile", default=None
+)
+
+
+@asynccontextmanager
+async def track(category: str) -> AsyncIterator[None]:
+    """
+    Records time spent in the block under given category ("config" or "rest")
+    for the command that is currently being profiled.
+
+    This is a no-op when no command is being profiled.
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    profile._depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile._depth -= 1
+        if not profile._depth:
+            profile.spent[category] += time.perf_counter() - start
+
+
+def timed(category: str) -> Callable[[Callable[..., Awaitable[_T]]], Callable[..., Awaitable[_T]]]:
+    """Decorator version of `track()` for coroutine functions."""
+
+    def decorator(func: Callable[..., Awaitable[_T]]) -> Callable[..., Awaitable[_T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> _T:
+            async with track(category):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class Profiler:
+    """
+    Opt-in per-command instrumentation.
+
+    While enabled, time spent by each command in Config, in Discord REST calls,
+    and in everything else ("python") is recorded in per-command histograms.
+    A single invocation of a command can also be captured with cProfile.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        # {COMMAND_NAME: {CATEGORY: Histogram}}
+        self.histograms: Dict[str, Dict[str, Histogram]] = {}
+        # qualified name of the command whose next invocation should be captured
+        self.capture_command: Optional[str] = None
+        self._captures: Dict[int, cProfile.Profile] = {}
+        self._tokens: Dict[int, contextvars.Token] = {}
+
+    def start(self, invocation_id: int, command_name: str) -> None:
+        if self.capture_command == command_name:
+            self.capture_command = None
+            profile = self._captures[invocation_id] = cProfile.Profile()
+            profile.enable()
+        if self.enabled:
+            self._tokens[invocation_id] = _current_profile.set(CommandProfile(command_name))
+
+    def stop(self, invocation_id: int) -> Optional[str]:
+        """
+        Records the profile of given invocation.
+
+        Returns the cProfile report if the invocation was captured.
+        """
+        report = None
+        capture = self._captures.pop(invocation_id, None)
+        if capture is not None:
+            capture.disable()
+            stream = io.StringIO()
+            pstats.Stats(capture, stream=stream).sort_stats("cumulative").print_stats(50)
+            report = stream.getvalue()
+
+        token = self._tokens.pop(invocation_id, None)
+        if token is None:
+            return report
+        profile = _current_profile.get()
+        _current_profile.reset(token)
+        if profile is None:
+            return report
+        total = time.perf_counter() - profile.start
+        histograms = self.histograms.setdefault(
+            profile.command_name, {category: Histogram() for category in (*CATEGORIES, "total")}
+        )
+        python_time = max(total - profile.spent["config"] - profile.spent["rest"], 0.0)
+        histograms["config"].add(profile.spent["config"])
+        histograms["rest"].add(profile.spent["rest"])
+        histograms["python"].add(python_time)
+        histograms["total"].add(total)
+        return report
+
+    def reset(self) -> None:
+        self.histograms.clear()
+
+    def summary(self) -> List[Tuple[str, int, Dict[str, Histogram]]]:
+        """Returns (COMMAND_NAME, INVOCATIONS, HISTOGRAMS) sorted by total time spent."""
+        return sorted(
+            (
+                (name, histograms["total"].count, histograms)
+                for name, histograms in self.histograms.items()
+            ),
+            key=lambda entry: entry[2]["total"].total,
+            reverse=True,
+        )
@@ -8,7 +8,8 @@ from redbot.core.bot import Red
 from redbot.core.config import Config
 from redbot.core import commands
 
-from .utils import static_property
+from .profiling import track
+from .utils import canonical_repo_url, normalize_repo_name, static_property
 
 CONFIG_COG_NAME = "CSMgr"
 CONFIG_IDENTIFIER = 59595922
@@ -54,12 +55,20 @@ class Repo:
         """This converter needs the argument before itself to be `discord.Member`"""
         user = ctx.args[-1]
         try:
-            return await cls.from_config(ctx.bot, user.id, argument)
+            return ctx.cog.registry.get_repo(user.id, argument)
         except KeyError:
             raise commands.BadArgument("Repo with this name doesn't exist for given member.")
 
     async def save(self) -> None:
-        await self.config.custom("REPO", *self.config_identifiers).set(self.to_dict())
+        async with track("config"):
+            await self.config.custom("REPO", *self.config_identifiers).set(self.to_dict())
+        if (registry := self.registry) is not None:
+            registry.store(self)
+
+    @property
+    def registry(self) -> Optional[RepoRegistry]:
+        cog = self.bot.get_cog(CONFIG_COG_NAME)
+        return None if cog is None else cog.registry
 
     @property
     def config_identifiers(self) -> Tuple[str, str]:
@@ -155,3 +164,109 @@ class Repo:
             raise KeyError("Repo with given name doesn't exist!")
 
         return Repo.from_dict(bot, user_id, repo_data)
+
+
+class RepoRegistry:
+    """
+    In-memory registry of all repos, loaded from Config once.
+
+    Writes go to Config first and are then applied to the registry
+    (see `Repo.save()` and `clear_user()`), so all reads can be served from memory.
+
+    Besides the lookup by user ID and repo name, the registry maintains secondary indexes
+    by canonical repo URL, support channel ID and normalized repo name.
+    """
+
+    def __init__(self, bot: Red) -> None:
+        self.bot = bot
+        # {USER_ID: {LOWERED_REPO_NAME: Repo}}
+        self._repos: Dict[int, Dict[str, Repo]] = {}
+        # {CANONICAL_URL: Repo}
+        self._by_url: Dict[str, Repo] = {}
+        # {SUPPORT_CHANNEL_ID: Repo}
+        self._by_channel: Dict[int, Repo] = {}
+        # {NORMALIZED_NAME: {(USER_ID, LOWERED_REPO_NAME): Repo}}
+        self._by_name: Dict[str, Dict[Tuple[int, str], Repo]] = {}
+        # {(USER_ID, LOWERED_REPO_NAME): (CANONICAL_URL, SUPPORT_CHANNEL_ID, NORMALIZED_NAME)}
+        self._index_keys: Dict[Tuple[int, str], Tuple[str, Optional[int], str]] = {}
+
+    async def load(self) -> None:
+        all_users = await Repo.from_config(self.bot)
+        self._repos.clear()
+        self._by_url.clear()
+        self._by_channel.clear()
+        self._by_name.clear()
+        self._index_keys.clear()
+        for repos in all_users.values():
+            for repo in repos:
+                self.store(repo)
+
+    def get_all_repos(self) -> Dict[int, List[Repo]]:
+        return {user_id: list(repos.values()) for user_id, repos in self._repos.items()}
+
+    def get_user_repos(self, user_id: int) -> List[Repo]:
+        return list(self._repos.get(user_id, {}).values())
+
+    def get_repo(self, user_id: int, repo_name: str) -> Repo:
+        try:
+            return self._repos[user_id][repo_name.lower()]
+        except KeyError:
+            raise KeyError("Repo with given name doesn't exist!") from None
+
+    def get_repo_by_url(self, url: str) -> Optional[Repo]:
+        return self._by_url.get(canonical_repo_url(url))
+
+    def get_repo_by_support_channel(self, channel_id: int) -> Optional[Repo]:
+        return self._by_channel.get(channel_id)
+
+    def find_repos_by_name(self, repo_name: str) -> List[Repo]:
+        return list(self._by_name.get(normalize_repo_name(repo_name), {}).values())
+
+    def store(self, repo: Repo) -> None:
+        """Add or replace given repo in the registry. This doesn't save it to Config."""
+        user_id, lowered_name = key = self._key(repo)
+        self._unindex(key)
+        self._repos.setdefault(user_id, {})[lowered_name] = repo
+
+        url_key = canonical_repo_url(repo.url)
+        name_key = normalize_repo_name(repo.name)
+        self._by_url[url_key] = repo
+        if repo.support_channel_id is not None:
+            self._by_channel[repo.support_channel_id] = repo
+        self._by_name.setdefault(name_key, {})[key] = repo
+        self._index_keys[key] = (url_key, repo.support_channel_id, name_key)
+
+    async def save_all(self, repos: List[Repo]) -> None:
+        """Save all given repos to Config in a single write and add them to the registry."""
+        async with track("config"), Repo.config.custom("REPO").all() as all_users:
+            for repo in repos:
+                user_id, lowered_name = repo.config_identifiers
+                all_users.setdefault(user_id, {})[lowered_name] = repo.to_dict()
+        for repo in repos:
+            self.store(repo)
+
+    async def clear_user(self, user_id: int) -> None:
+        """Remove all repos of given user from Config and the registry."""
+        async with track("config"):
+            await Repo.config.custom("REPO").clear_raw(str(user_id))
+        for lowered_name in self._repos.pop(user_id, {}):
+            self._unindex((user_id, lowered_name))
+
+    @staticmethod
+    def _key(repo: Repo) -> Tuple[int, str]:
+        return repo.user_id, repo.config_identifiers[1]
+
+    def _unindex(self, key: Tuple[int, str]) -> None:
+        try:
+            url_key, channel_id, name_key = self._index_keys.pop(key)
+        except KeyError:
+            return
+        # another repo might have taken over the key in the meantime
+        if (repo := self._by_url.get(url_key)) is not None and self._key(repo) == key:
+            del self._by_url[url_key]
+        if (repo := self._by_channel.get(channel_id)) is not None and self._key(repo) == key:
+            del self._by_channel[channel_id]
+        same_name = self._by_name.get(name_key, {})
+        same_name.pop(key, None)
+        if not same_name:
+            self._by_name.pop(name_key, None)
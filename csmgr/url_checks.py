@@ -0,0 +1,118 @@
+from enum import Enum
+from typing import Optional, Set, Tuple
+
+import aiohttp
+import yarl
+
+from .utils import TTLCache, canonical_repo_url, parse_repo_url
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# statuses hosts use to tell that they don't support HEAD requests
+HEAD_NOT_ALLOWED_STATUSES = {405, 501}
+# how long check results are cached, in seconds
+POSITIVE_TTL = 3600
+NEGATIVE_TTL = 600
+CACHE_SIZE = 2048
+
+
+class UnexpectedStatusError(aiohttp.ClientError):
+    """Raised when the host answered with a status that doesn't tell whether the repo exists."""
+
+    def __init__(self, url: str, status: int) -> None:
+        super().__init__(f"Unexpected status {status} for {url}")
+        self.url = url
+        self.status = status
+
+
+class UrlStatus(Enum):
+    EXISTS = "exists"
+    REDIRECTED = "redirected"
+    MISSING = "missing"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class RepoUrlChecker:
+    """
+    Checks whether repo URLs exist.
+
+    HEAD requests are used for hosts that allow them, other hosts get a GET request.
+    Results are cached by canonical URL, missing repos for a shorter time than existing ones.
+    Failures to reach the host are not cached.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        *,
+        positive_ttl: float = POSITIVE_TTL,
+        negative_ttl: float = NEGATIVE_TTL,
+        cache_size: int = CACHE_SIZE,
+    ) -> None:
+        self.session = session
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._no_head_hosts: Set[str] = set()
+        self._cache: TTLCache[Tuple[UrlStatus, Optional[str]]] = TTLCache(cache_size)
+
+    async def check(self, url: str, *, use_cache: bool = True) -> UrlStatus:
+        """
+        Checks given repo URL.
+
+        Raises `aiohttp.ClientError` or `asyncio.TimeoutError` if the host couldn't be reached
+        or answered with an unexpected status, e.g. because of rate limits.
+        """
+        status, _ = await self.check_with_location(url, use_cache=use_cache)
+        return status
+
+    async def check_with_location(
+        self, url: str, *, use_cache: bool = True
+    ) -> Tuple[UrlStatus, Optional[str]]:
+        """
+        Checks given repo URL and also returns where it redirects to, if it does.
+
+        With `use_cache=False`, the URL is always requested, the result still gets cached.
+
+        Raises `aiohttp.ClientError` or `asyncio.TimeoutError` if the host couldn't be reached
+        or answered with an unexpected status, e.g. because of rate limits.
+        """
+        key = canonical_repo_url(url)
+        if use_cache:
+            result = self._cache.get(key)
+            if result is not None:
+                return result
+        result = await self._check(url)
+        ttl = self.negative_ttl if result[0] is UrlStatus.MISSING else self.positive_ttl
+        self._cache.set(key, result, ttl)
+        return result
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """Drops cached result for given URL or all cached results if no URL is passed."""
+        if url is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(canonical_repo_url(url))
+
+    async def _check(self, url: str) -> Tuple[UrlStatus, Optional[str]]:
+        service, _, _ = parse_repo_url(url)
+        status, location = await self._get_status(url)
+        # GitLab redirects to the sign in page for repos that don't exist
+        if service.lower() == "gitlab" and status == 302 or status == 404:
+            return UrlStatus.MISSING, None
+        if status in REDIRECT_STATUSES:
+            return UrlStatus.REDIRECTED, location
+        if 200 <= status < 300:
+            return UrlStatus.EXISTS, None
+        # rate limits (403/429) and server errors say nothing about the repo and aren't cached
+        raise UnexpectedStatusError(url, status)
+
+    async def _get_status(self, url: str) -> Tuple[int, Optional[str]]:
+        host = yarl.URL(url).host
+        if host not in self._no_head_hosts:
+            async with self.session.head(url, allow_redirects=False) as resp:
+                if resp.status not in HEAD_NOT_ALLOWED_STATUSES:
+                    return resp.status, resp.headers.get("Location")
+            self._no_head_hosts.add(host)
+        async with self.session.get(url, allow_redirects=False) as resp:
+            return resp.status, resp.headers.get("Location")
@@ -1,10 +1,29 @@
 import itertools
-from typing import Callable, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+import re
+import time
+from collections import OrderedDict
+from typing import (
+    Callable,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
+import discord
 import yarl
 
 _T = TypeVar("_T")
 
+# Discord's limits, see https://discord.com/developers/docs/resources/channel#embed-object-embed-limits
+EMBED_TOTAL_LIMIT = 6000
+EMBED_FIELDS_LIMIT = 25
+EMBEDS_PER_MESSAGE_LIMIT = 10
+
 
 class static_property(Generic[_T]):
     """Static property. @staticmethod decorator is required."""
@@ -16,6 +35,47 @@ class static_property(Generic[_T]):
         return self.func()
 
 
+class TTLCache(Generic[_T]):
+    """
+    Bounded LRU cache with per-entry expiry.
+
+    Each entry is stored with its own TTL (in seconds). When the cache is full,
+    the least recently used entry is evicted.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        # {KEY: (EXPIRES_AT, VALUE)} ordered from least to most recently used
+        self._data: "OrderedDict[Hashable, Tuple[float, _T]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[_T]:
+        """Returns the value for given key or `None` if it's not cached or already expired."""
+        try:
+            expires_at, value = self._data[key]
+        except KeyError:
+            return None
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: _T, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
 def grouper(iterable: Iterable[_T], n: int) -> Iterator[List[_T]]:
     """
     Make an iterator that returns lists of length n or lower
@@ -30,6 +90,41 @@ def grouper(iterable: Iterable[_T], n: int) -> Iterator[List[_T]]:
         yield list(itertools.islice(itertools.chain((first_item,), iterator), n))
 
 
+def pack(
+    iterable: Iterable[_T], *, size: Callable[[_T], int], max_size: int, max_count: int
+) -> Iterator[List[_T]]:
+    """
+    Make an iterator that returns lists of consecutive items from passed `iterable`,
+    each holding as many items as fit in `max_count` items and `max_size` total `size`.
+
+    Items are pulled from `iterable` only as needed to fill the next list.
+
+    Raises `ValueError` if a single item is bigger than `max_size`.
+    """
+    group: List[_T] = []
+    group_size = 0
+    for item in iterable:
+        item_size = size(item)
+        if item_size > max_size:
+            raise ValueError(f"Item of size {item_size} doesn't fit in the limit of {max_size}.")
+        if group and (len(group) >= max_count or group_size + item_size > max_size):
+            yield group
+            group = []
+            group_size = 0
+        group.append(item)
+        group_size += item_size
+    if group:
+        yield group
+
+
+def pack_embeds(embeds: Iterable[discord.Embed]) -> Iterator[List[discord.Embed]]:
+    """
+    Make an iterator that returns lists of embeds that fit in a single message,
+    i.e. at most 10 embeds with at most 6000 characters in total.
+    """
+    return pack(embeds, size=len, max_size=EMBED_TOTAL_LIMIT, max_count=EMBEDS_PER_MESSAGE_LIMIT)
+
+
 def parse_repo_url(url: str) -> Tuple[str, str, str]:
     """
     Parses given repo URL and returns 3-tuple of service name, repo owner, and repo name.
@@ -42,3 +137,28 @@ def parse_repo_url(url: str) -> Tuple[str, str, str]:
     repo_owner, repo_name = parsed.parts[1:3]
 
     return service_name, repo_owner, repo_name
+
+
+def canonical_repo_url(url: str) -> str:
+    """
+    Returns canonical form of given repo URL, meant for comparing URLs.
+
+    Scheme, letter case, `www.` prefix, trailing slash and `.git` suffix are ignored.
+    """
+    parsed = yarl.URL(url.strip())
+    host = (parsed.host or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parsed.path.strip("/").lower()
+    if path.endswith(".git"):
+        path = path[:-4]
+    return f"{host}/{path}"
+
+
+def normalize_repo_name(name: str) -> str:
+    """
+    Returns normalized form of given repo name, meant for comparing names.
+
+    Letter case and all non-alphanumeric characters are ignored.
+    """
+    return re.sub(r"[^0-9a-z]", "", name.lower())
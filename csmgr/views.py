@@ -0,0 +1,114 @@
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import discord
+from redbot.core import commands
+
+from .utils import EMBED_FIELDS_LIMIT, EMBED_TOTAL_LIMIT, pack
+
+# room left for the "Page X/Y" footer
+_FOOTER_RESERVE = 32
+
+
+class FieldPageSource:
+    """
+    Lazily packs embed fields into pages that fit in Discord's embed limits.
+
+    Each page holds up to 25 fields and 6000 characters in total.
+    Fields are pulled from `fields` only when a page that needs them is requested
+    and packed pages are cached, so going back to a page doesn't render its fields again.
+    """
+
+    def __init__(self, fields: Iterable[Tuple[str, str]], *, title: str) -> None:
+        self.title = title
+        self._groups: Iterator[List[Tuple[str, str]]] = pack(
+            fields,
+            size=lambda field: len(field[0]) + len(field[1]),
+            max_size=EMBED_TOTAL_LIMIT - len(title) - _FOOTER_RESERVE,
+            max_count=EMBED_FIELDS_LIMIT,
+        )
+        self._pages: List[List[Tuple[str, str]]] = []
+        # `None` until all fields were packed
+        self.page_count: Optional[int] = None
+
+    def has_page(self, page_number: int) -> bool:
+        while len(self._pages) <= page_number and self.page_count is None:
+            try:
+                self._pages.append(next(self._groups))
+            except StopIteration:
+                self.page_count = len(self._pages)
+        return page_number < len(self._pages)
+
+    def get_page(self, page_number: int) -> discord.Embed:
+        if not self.has_page(page_number):
+            raise IndexError("Page number out of range.")
+        embed = discord.Embed(title=self.title)
+        for name, value in self._pages[page_number]:
+            embed.add_field(name=name, value=value)
+        total = "?" if self.page_count is None else self.page_count
+        embed.set_footer(text=f"Page {page_number + 1}/{total}")
+        return embed
+
+
+class LazyPageMenu(discord.ui.View):
+    """
+    Paginated menu that renders its pages only when they're requested.
+
+    Showing a page only needs the page itself and a check whether the next page exists.
+    """
+
+    def __init__(
+        self, source: FieldPageSource, *, author_id: int, timeout: float = 60.0
+    ) -> None:
+        super().__init__(timeout=timeout)
+        self.source = source
+        self.author_id = author_id
+        self.current_page = 0
+        self.message: Optional[discord.Message] = None
+
+    async def start(self, ctx: commands.Context) -> None:
+        # checking the next page first lets the footer show the total when it's known
+        self._update_buttons()
+        embed = self.source.get_page(0)
+        view = self if self.source.has_page(1) else None
+        self.message = await ctx.send(embed=embed, view=view)
+        if view is None:
+            self.stop()
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message(
+                "You're not the author of this menu.", ephemeral=True
+            )
+            return False
+        return True
+
+    async def on_timeout(self) -> None:
+        if self.message is None:
+            return
+        try:
+            await self.message.edit(view=None)
+        except discord.HTTPException:
+            pass
+
+    def _update_buttons(self) -> None:
+        self.previous_page.disabled = self.current_page == 0
+        self.next_page.disabled = not self.source.has_page(self.current_page + 1)
+
+    async def _show_page(self, interaction: discord.Interaction, page_number: int) -> None:
+        self.current_page = page_number
+        self._update_buttons()
+        embed = self.source.get_page(page_number)
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(emoji="\N{LEFTWARDS BLACK ARROW}", style=discord.ButtonStyle.grey)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show_page(interaction, self.current_page - 1)
+
+    @discord.ui.button(emoji="\N{BLACK RIGHTWARDS ARROW}", style=discord.ButtonStyle.grey)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show_page(interaction, self.current_page + 1)
+
+    @discord.ui.button(emoji="\N{CROSS MARK}", style=discord.ButtonStyle.grey)
+    async def close(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.stop()
+        await interaction.response.edit_message(view=None)
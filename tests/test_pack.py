@@ -0,0 +1,70 @@
+import random
+
+import discord
+import pytest
+
+from csmgr.utils import (
+    EMBED_FIELDS_LIMIT,
+    EMBED_TOTAL_LIMIT,
+    EMBEDS_PER_MESSAGE_LIMIT,
+    pack,
+    pack_embeds,
+)
+from csmgr.views import FieldPageSource
+
+
+def _random_text(rng: random.Random, max_length: int) -> str:
+    return "x" * rng.randint(1, max_length)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_pack_embeds_stays_within_message_limits(seed: int) -> None:
+    rng = random.Random(seed)
+    embeds = [
+        discord.Embed(title=str(idx), description=_random_text(rng, 4000))
+        for idx in range(rng.randint(1, 60))
+    ]
+
+    groups = list(pack_embeds(embeds))
+
+    for group in groups:
+        assert 1 <= len(group) <= EMBEDS_PER_MESSAGE_LIMIT
+        assert sum(map(len, group)) <= EMBED_TOTAL_LIMIT
+    assert [embed for group in groups for embed in group] == embeds
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_field_page_source_stays_within_embed_limits(seed: int) -> None:
+    rng = random.Random(seed)
+    fields = [
+        (f"field {idx}", _random_text(rng, 1024)) for idx in range(rng.randint(1, 300))
+    ]
+    source = FieldPageSource(fields, title="Repos")
+
+    pages = []
+    page_number = 0
+    while source.has_page(page_number):
+        pages.append(source.get_page(page_number))
+        page_number += 1
+
+    assert source.page_count == len(pages)
+    for embed in pages:
+        assert 1 <= len(embed.fields) <= EMBED_FIELDS_LIMIT
+        assert len(embed) <= EMBED_TOTAL_LIMIT
+    assert [(f.name, f.value) for embed in pages for f in embed.fields] == fields
+
+
+def test_pack_keeps_order_and_limits() -> None:
+    items = list(range(1, 30))
+
+    groups = list(pack(items, size=lambda item: item, max_size=40, max_count=4))
+
+    for group in groups:
+        assert len(group) <= 4
+        assert sum(group) <= 40
+    assert [item for group in groups for item in group] == items
+
+
+def test_pack_raises_for_oversized_item() -> None:
+    with pytest.raises(ValueError):
+        list(pack(["ok", "x" * 11], size=len, max_size=10, max_count=5))